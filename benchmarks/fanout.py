@@ -0,0 +1,58 @@
+"""Time sending one command to many clients.
+
+Compares socket.io encoding the message for each client
+with bowtie encoding it once. Run with ``make benchmark``.
+"""
+
+import time
+
+from engineio.socket import Socket
+import socketio
+
+from bowtie._broadcast import BroadcastManager
+from bowtie._component import pack
+
+CLIENTS = [10, 100, 1000]
+REPEAT = 5
+
+
+def server(manager, clients):
+    """Create a server with fake connected clients."""
+    sio = socketio.Server(async_mode='eventlet', client_manager=manager, binary=True)
+    sio.manager.initialize()
+    sockets = []
+    for i in range(clients):
+        sid = str(i)
+        sock = Socket(sio.eio, sid)
+        sio.eio.sockets[sid] = sock
+        sio.manager.connect(sid, '/')
+        sockets.append(sock)
+    return sio, sockets
+
+
+def fanout(sio, sockets, data):
+    """Broadcast the data and encode the frames like the websocket writer."""
+    start = time.perf_counter()
+    sio.emit('1#all', {'data': data})
+    for sock in sockets:
+        while not sock.queue.empty():
+            sock.queue.get().encode(always_bytes=False)
+    return time.perf_counter() - start
+
+
+def main():
+    """Print the best time of each manager for each number of clients."""
+    figure = {'data': [{'x': list(range(50000)), 'y': [i * 0.5 for i in range(50000)]}]}
+    data = pack(figure)
+    print(f'payload {len(data) / 1e6:.1f} MB')
+    print(f'{"clients":>8} {"socket.io":>10} {"bowtie":>10}')
+    for clients in CLIENTS:
+        times = []
+        for manager in [socketio.BaseManager(), BroadcastManager()]:
+            sio, sockets = server(manager, clients)
+            times.append(min(fanout(sio, sockets, data) for _ in range(REPEAT)))
+        print(f'{clients:>8} {times[0] * 1000:>8.1f}ms {times[1] * 1000:>8.1f}ms')
+
+
+if __name__ == '__main__':
+    main()
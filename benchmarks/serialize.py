@@ -0,0 +1,48 @@
+"""Time encoding the objects msgpack and json don't understand.
+
+Each leaf goes through the encoder dispatch once, run with ``make benchmark``.
+"""
+
+from datetime import date
+import timeit
+
+import numpy as np
+
+from bowtie._component import encoders, jdumps, pack
+
+LEAVES = 10000
+REPEAT = 7
+
+
+class Unknown:
+    """Type without an encoder."""
+
+
+CASES = {
+    'np.int32': np.int32(1),
+    'np.float32': np.float32(1.5),
+    'date': date(2018, 1, 1),
+    'unknown': Unknown(),
+}
+
+
+def best(func):
+    """Best time of a call in seconds."""
+    return min(timeit.repeat(func, number=1, repeat=REPEAT))
+
+
+def main():
+    """Print the time per leaf of the encoder, pack and jdumps."""
+    print(f'{"leaf":>12} {"encoder":>10} {"pack":>10} {"jdumps":>10}')
+    for name, leaf in CASES.items():
+        leaves = [leaf] * LEAVES
+        times = [best(lambda: [encoders(x) for x in leaves])]
+        if name == 'unknown':
+            times += [float('nan')] * 2
+        else:
+            times += [best(lambda: pack(leaves)), best(lambda: jdumps(leaves))]
+        print(f'{name:>12}' + ''.join(f' {t / LEAVES * 1e6:>7.2f} us' for t in times))
+
+
+if __name__ == '__main__':
+    main()
@@ -4,8 +4,9 @@ __version__ = '0.11.1-dev'
 
 from bowtie._app import App, View
 from bowtie._command import command
+from bowtie._component import register_encoder
 from bowtie.pager import Pager
-from bowtie._cache import cache
+from bowtie._cache import cache, MemoryCache, DiskCache
 
 
 def load_ipython_extension(ipython):
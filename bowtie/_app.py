@@ -12,21 +12,19 @@ from typing import (  # pylint: disable=unused-import
     Dict,
     Sequence,
 )
+from concurrent.futures import Executor
 import os
 import json
 import itertools
 import shutil
 from collections import namedtuple, defaultdict
+from functools import partial
 from subprocess import Popen, PIPE, STDOUT, check_output
 from pathlib import Path
 import secrets
-import socket
 import warnings
-import traceback
 
 import eventlet
-import msgpack
-import flask
 from flask import (
     Flask,
     render_template,
@@ -38,7 +36,30 @@ from flask import (
 from flask_socketio import SocketIO
 from jinja2 import Environment, FileSystemLoader, ChoiceLoader
 
-from bowtie._component import Event, Component, COMPONENT_REGISTRY
+from bowtie._component import (
+    Event,
+    Component,
+    COMPONENT_REGISTRY,
+    SEPARATOR,
+    get_many,
+    is_event,
+    jdumps,
+    DATETIME_FORMATS,
+    session,
+    unpack,
+)
+from bowtie._assets import Assets
+from bowtie._broadcast import BroadcastManager
+from bowtie._cache import CacheBackend
+from bowtie._executor import Offloaded
+from bowtie._memoize import Memoized
+from bowtie._mirror import StateMirror
+from bowtie._outbox import Outbox
+from bowtie._queue import LOCAL, LocalManager
+from bowtie._ratelimit import LatestWins, RateLimit
+from bowtie._scheduler import Scheduler
+from bowtie._server import Server
+from bowtie._views import ViewTracker
 from bowtie.pager import Pager
 from bowtie.exceptions import (
     GridIndexError,
@@ -59,46 +80,7 @@ _Import = namedtuple('_Import', ['module', 'component'])
 _DIRECTORY = Path('build')
 _WEBPACK = './node_modules/.bin/webpack'
 _MIN_NODE_VERSION = 8, 10, 0
-
-
-class Scheduler:
-    """Run scheduled tasks."""
-
-    def __init__(self, app, seconds, func):
-        """Create a scheduled function."""
-        self.app = app
-        self.seconds = seconds
-        self.func = func
-        self.thread = None
-
-    def context(self, func):
-        """Provide flask context to function."""
-        # docstyle
-
-        def wrap():
-            with self.app.app_context():
-                func()
-
-        return wrap
-
-    def start(self):
-        """Start the scheduled task."""
-        self.thread = eventlet.spawn(self.run)
-
-    def run(self):
-        """Invoke the function repeatedly on a timer."""
-        ret = eventlet.spawn(self.context(self.func))
-        eventlet.sleep(self.seconds)
-        try:
-            ret.wait()
-        except Exception:  # pylint: disable=broad-except
-            traceback.print_exc()
-        self.thread = eventlet.spawn(self.run)
-
-    def stop(self):
-        """Stop the scheduled task."""
-        if self.thread:
-            self.thread.cancel()
+_PACKAGE_DIR = Path(__file__).parent
 
 
 def raise_not_number(x: float) -> None:
@@ -622,6 +604,12 @@ class App:
         background_color: str = 'White',
         socketio: str = '',
         debug: bool = False,
+        max_frame_rate: Optional[float] = None,
+        mirror_state: bool = False,
+        cache: Optional[CacheBackend] = None,
+        message_queue: Optional[str] = None,
+        datetime_format: str = 'iso',
+        encode_once: bool = False,
     ) -> None:
         """Create a Bowtie App.
 
@@ -651,24 +639,59 @@ class App:
             Socket.io path prefix, only change this for advanced deployments.
         debug : bool, optional
             Enable debugging in Flask. Disable in production!
+        max_frame_rate : float, optional
+            Limit the number of messages per second sent to each client.
+            Commands issued faster than this are combined into a single message,
+            only the latest value is sent for commands that replace state,
+            e.g. ``do_value`` or ``do_data``.
+            By default every command is sent immediately.
+        mirror_state : bool, optional
+            Keep the last value each client reported for every component on the server.
+            Getters and callbacks subscribed to several events use it instead of
+            asking the browser, they only ask when no value has been reported yet
+            or a command was sent to the component since.
+        cache : CacheBackend, optional
+            Where ``bowtie.cache`` stores data, e.g. ``MemoryCache()`` keeps it in the
+            server's memory. By default it's stored in the browser.
+        message_queue : str, optional
+            URL of a message queue shared by several server processes, e.g. ``redis://``.
+            ``local:///path/to/directory`` shares messages between processes on one machine
+            without a message queue service. Browsers only connect with websockets
+            so the processes don't need sticky sessions.
+        datetime_format : str, optional
+            How datetimes are sent to the browser. ``'iso'`` sends ISO 8601 strings.
+            ``'epoch'`` sends milliseconds since the Unix epoch, the same numbers
+            Javascript's ``Date`` uses, numpy and pandas datetimes are converted all at once
+            and sent as a single ``Float64Array`` with ``NaN`` for missing values.
+            Naive datetimes are treated as UTC.
+        encode_once : bool, optional
+            Encode commands sent to several clients once and queue the same frames
+            for every client instead of letting socket.io encode them for each client.
+            It relies on internals of python-socketio and python-engineio,
+            see ``bowtie._broadcast``.
 
         """
+        if datetime_format not in DATETIME_FORMATS:
+            raise ValueError(
+                f'Datetime format must be one of {DATETIME_FORMATS}, found {datetime_format}.'
+            )
         self.title = title
         self.theme = theme
         self._init: Optional[Callable] = None
         self._socketio_path = socketio
-        self._schedules: List[Scheduler] = []
         self._subscriptions: Dict[Event, List[Tuple[List[Event], Callable]]] = defaultdict(list)
         self._pages: Dict[Pager, Callable] = {}
         self._uploads: Dict[int, Callable] = {}
+        self._limits: Dict[Event, RateLimit] = {}
+        self._latest = LatestWins()
+        self._latest_funcs: Set[Callable] = set()
         self._root = View(
             rows=rows, columns=columns, sidebar=sidebar, background_color=background_color
         )
         self._routes: List[Route] = []
 
-        self._package_dir = Path(os.path.dirname(__file__))
         self._jinjaenv = Environment(
-            loader=FileSystemLoader(str(self._package_dir / 'templates')),
+            loader=FileSystemLoader(str(_PACKAGE_DIR / 'templates')),
             trim_blocks=True,
             lstrip_blocks=True,
         )
@@ -677,20 +700,54 @@ class App:
         else:
             self.app = app
         self.app.debug = debug
-        self._socketio = SocketIO(self.app, binary=True, path=socketio + 'socket.io')
+        queue: Dict[str, Any] = {}
+        if message_queue is None:
+            if encode_once:
+                queue['client_manager'] = BroadcastManager()
+        elif message_queue.startswith(LOCAL):
+            queue['client_manager'] = LocalManager(message_queue, encode_once=encode_once)
+        else:
+            queue['message_queue'] = message_queue
+        sio = SocketIO(self.app, binary=True, path=socketio + 'socket.io', **queue)
+        views = ViewTracker()
+        self._server = Server(sio, Outbox(sio, max_frame_rate, views), views, message_queue)
+        self.app.extensions['bowtie.outbox'] = self._outbox
+        self.app.extensions['bowtie.datetime_format'] = datetime_format
+        self._mirror = StateMirror() if mirror_state else None
+        if self._mirror is not None:
+            self.app.extensions['bowtie.mirror'] = self._mirror
+        self._cache = cache
+        if self._cache is not None:
+            self.app.extensions['bowtie.cache'] = self._cache
         self.app.secret_key = secrets.token_bytes()
         self.add_route(view=self._root, path='/', exact=True)
 
         # https://buxty.com/b/2012/05/custom-template-folders-with-flask/
-        templates = Path(__file__).parent / 'templates'
+        templates = _PACKAGE_DIR / 'templates'
         self.app.jinja_loader = ChoiceLoader(  # type: ignore
             [self.app.jinja_loader, FileSystemLoader(str(templates))]
         )
         self._build_dir = self.app.root_path / _DIRECTORY  # type: ignore
-        self.app.before_first_request(self._endpoints)
+        self._assets = Assets(self._build_dir, reload=debug)
+        self._chunks = Assets(self._build_dir / 'chunks')
+        self.app.before_first_request(self._prepare)
+
+    @property
+    def _socketio(self) -> SocketIO:
+        return self._server.socketio
+
+    @property
+    def _outbox(self) -> Outbox:
+        return self._server.outbox
+
+    @property
+    def _views(self) -> ViewTracker:
+        return self._server.views
 
     def wsgi_app(self, environ, start_response):
         """Support uwsgi and gunicorn."""
+        # every worker prepares itself, socket.io requests don't reach flask's hooks
+        self._prepare()
         return self.app.wsgi_app(environ, start_response)
 
     def __call__(self, environ, start_response):
@@ -768,10 +825,21 @@ class App:
         self._routes.append(Route(view=view, path=path, exact=exact))
 
         self.app.add_url_rule(
-            path, path[1:], lambda: render_template('bowtie.html', title=self.title)
+            path,
+            path[1:],
+            lambda: render_template(
+                'bowtie.html', title=self.title, version=self._assets.version('bundle.js')
+            ),
         )
 
-    def subscribe(self, *events: Union[Event, Pager]) -> Callable:
+    def subscribe(
+        self,
+        *events: Union[Event, Pager],
+        debounce: Optional[float] = None,
+        throttle: Optional[float] = None,
+        latest_wins: bool = False,
+        executor: Optional[Union[str, Executor]] = None,
+    ) -> Callable:
         """Call a function in response to an event.
 
         If more than one event is given, `func` will be given
@@ -783,6 +851,25 @@ class App:
         ----------
         *event : event or pager
             Bowtie event, must have at least one.
+        debounce : float, optional
+            Only send the events once they stop firing for this many seconds,
+            e.g. when a user stops dragging a slider.
+        throttle : float, optional
+            Send the events at most once every this many seconds.
+            The limits apply to the events, the browser holds them back
+            and the server enforces them for each client as well.
+            So every function subscribed to a limited event is limited,
+            and an event can't be limited again with different values.
+            With ``mirror_state`` the state of limited events isn't mirrored,
+            getters ask the browser for it instead of using a stale value.
+        latest_wins : bool, optional
+            When a newer event arrives while the function is still running for
+            the same client, kill the running call so it doesn't send stale results.
+        executor : str or Executor, optional
+            Run the function in a "thread" or "process" pool, or the given executor,
+            so CPU heavy functions don't block other clients.
+            Commands are sent once the function returns,
+            the function can't use getters or the cache.
 
         Examples
         --------
@@ -811,6 +898,12 @@ class App:
         >>> def scheduledtask():
         ...     pager.notify()
 
+        Running a callback after the user stops moving the slider.
+
+        >>> @app.subscribe(slide.on_change, debounce=0.2)
+        ... def callback3(value):
+        ...     pass
+
         """
         try:
             first_event = events[0]
@@ -832,8 +925,27 @@ class App:
                         'It must be used alone.'
                     )
 
+        if debounce is not None or throttle is not None:
+            limit = RateLimit(debounce=debounce, throttle=throttle)
+            # check every event before limiting any of them
+            limited: List[Event] = []
+            for event in events:
+                if isinstance(event, Pager) or event.name == 'upload':
+                    raise ValueError('Only component events can be debounced or throttled.')
+                if event in self._limits and self._limits[event].to_json() != limit.to_json():
+                    raise ValueError(
+                        f'{event.uuid}.on_{event.name} is already limited by '
+                        f'{self._limits[event].to_json()}.'
+                    )
+                limited.append(event)
+            for event in limited:
+                self._limits.setdefault(event, limit)
+
         def decorator(func: Callable) -> Callable:
             """Handle three types of events: pages, uploads, and normal events."""
+            original = func
+            if executor is not None:
+                func = Offloaded(func, executor)
             if isinstance(first_event, Pager):
                 self._pages[first_event] = func
             elif first_event.name == 'upload':
@@ -851,11 +963,13 @@ class App:
                     )
                 self._uploads[first_event.uuid] = func
             else:
+                if latest_wins:
+                    self._latest_funcs.add(func)
                 for event in events:
                     # need to have `events` here to maintain order of arguments
                     # not sure how to deal with mypy typing errors on events so ignoring
                     self._subscriptions[event].append((events, func))  # type: ignore
-            return func
+            return original
 
         return decorator
 
@@ -871,24 +985,169 @@ class App:
         self._init = func
         return func
 
-    def schedule(self, seconds: float):
+    def schedule(  # pylint: disable=too-many-arguments
+        self,
+        seconds: Optional[float] = None,
+        executor: Optional[Union[str, Executor]] = None,
+        per_session: bool = False,
+        mode: str = 'rate',
+        overlap: str = 'skip',
+        cron: Optional[str] = None,
+        pause_idle: bool = False,
+    ):
         """Call a function periodically.
 
         Parameters
         ----------
-        seconds : float
-            Minimum interval of function calls.
+        seconds : float, optional
+            Interval of function calls, required without ``cron``.
+        executor : str or Executor, optional
+            Run the function in a "thread" or "process" pool, or the given executor.
+            Commands are sent once the function returns.
+        per_session : bool, optional
+            Call the function once for each connected client,
+            its commands, getters and cache requests only go to that client.
+            By default the function is called once and its commands go to every client.
+        mode : str, optional
+            With "rate" the function is called every ``seconds`` regardless of
+            how long it runs, with "delay" it's called ``seconds`` after the last call returned.
+        overlap : str, optional
+            At a fixed rate, when the last call is still running a call that's due is
+            skipped with "skip", runs after it with "queue" or runs alongside it with "concurrent".
+            With "queue" at most one call waits, the others are skipped.
+        cron : str, optional
+            Call the function at the times matching a cron expression, e.g. ``"*/5 9-17 * * 1-5"``.
+        pause_idle : bool, optional
+            Pause while no clients are connected. With a message queue
+            only functions called for each client are paused since the clients
+            may be connected to another worker.
         func : callable
             Function to be called.
 
+        Examples
+        --------
+        >>> app = App()
+        >>> @app.schedule(cron='0 * * * *', overlap='queue')
+        ... def hourly():
+        ...     pass
+        >>> app.schedules[0].stats()['runs']
+        0
+
         """
         # docstyle
 
-        def wrap(func: Callable):
-            self._schedules.append(Scheduler(self.app, seconds, func))
+        def wrap(func: Callable) -> Callable:
+            task = func if executor is None else Offloaded(func, executor)
+            if per_session:
+                task = self._server.each_session(task)
+            self._server.schedules.append(
+                Scheduler(
+                    self.app,
+                    seconds,
+                    task,
+                    per_session,
+                    mode=mode,
+                    overlap=overlap,
+                    cron=cron,
+                    name=func.__name__,
+                    pause_idle=pause_idle and (per_session or self._server.message_queue is None),
+                )
+            )
+            # return the function itself so it can be pickled for a process pool
+            return func
 
         return wrap
 
+    @property
+    def schedules(self) -> List[Scheduler]:
+        """Scheduled functions, their ``stats`` report lateness, run time and latency."""
+        return list(self._server.schedules)
+
+    @property
+    def sessions(self) -> List[str]:
+        """Session ids of the connected clients."""
+        return list(self._server.sessions)
+
+    def session(self, sid: str):
+        """Send commands, getters and cache requests in a block to one client.
+
+        Outside of an event, e.g. in a scheduled function, commands go to every client.
+        Use this to only update one of them. Green threads spawned in the block
+        go to every client again.
+
+        Parameters
+        ----------
+        sid : str
+            Session id of the client, see ``sessions``.
+
+        Examples
+        --------
+        >>> from bowtie.control import Slider
+        >>> app = App()
+        >>> slider = Slider()
+        >>> @app.schedule(1)
+        ... def update():
+        ...     for i, sid in enumerate(app.sessions):
+        ...         with app.session(sid):
+        ...             slider.do_value(i)
+
+        """
+        return session(sid)
+
+    def batch(self):
+        """Send all commands issued in a block as a single message.
+
+        The browser applies the whole batch in one update,
+        so the components only render once.
+
+        Examples
+        --------
+        >>> from bowtie.control import Slider
+        >>> from bowtie.visual import Plotly
+        >>> app = App()
+        >>> slider = Slider()
+        >>> plot = Plotly()
+        >>> def callback(value):
+        ...     with app.batch():
+        ...         plot.do_relayout({'title': str(value)})
+        ...         slider.do_value(value)
+
+        """
+        return self._outbox.batch()
+
+    def memoize(self, maxsize: Optional[int] = 128, ttl: Optional[float] = None) -> Callable:
+        """Cache the commands a callback sends for each combination of its arguments.
+
+        When the callback is called again with the same arguments the cached
+        commands are sent again without calling it.
+        The decorated function has ``hits`` and ``misses`` counters,
+        ``cache_info()`` and ``cache_clear()``.
+
+        Parameters
+        ----------
+        maxsize : int, optional
+            Number of argument combinations to keep, the least recently used are dropped.
+            None keeps all of them.
+        ttl : float, optional
+            Seconds until a cached result expires, by default they never expire.
+
+        Examples
+        --------
+        >>> from bowtie.control import Dropdown
+        >>> app = App()
+        >>> dropdown = Dropdown()
+        >>> @app.subscribe(dropdown.on_change)
+        ... @app.memoize(maxsize=32)
+        ... def callback(item):
+        ...     pass
+
+        """
+
+        def decorator(func: Callable) -> Memoized:
+            return Memoized(func, maxsize=maxsize, ttl=ttl)
+
+        return decorator
+
     def _write_templates(self) -> Set[str]:
         indexjsx = self._jinjaenv.get_template('index.jsx.j2')
         componentsjs = self._jinjaenv.get_template('components.js.j2')
@@ -900,9 +1159,12 @@ class App:
         with webpack_path.open('w') as f:
             f.write(webpack.render(color=self.theme))
 
+        # chunks of previous builds
+        shutil.rmtree(self._build_dir / 'chunks', ignore_errors=True)
+
         # copy js modules that are always needed
-        for name in ['progress.jsx', 'view.jsx', 'utils.js']:
-            template_src = self._package_dir / 'src' / name
+        for name in ['publicpath.js', 'progress.jsx', 'view.jsx', 'utils.js', 'cache.js']:
+            template_src = _PACKAGE_DIR / 'src' / name
             shutil.copy(template_src, src)
 
         # Layout Design
@@ -930,13 +1192,19 @@ class App:
             imports |= route.view._imports  # pylint: disable=protected-access
             components |= route.view._components  # pylint: disable=protected-access
             for template in route.view._templates:  # pylint: disable=protected-access
-                template_src = self._package_dir / 'src' / template
+                template_src = _PACKAGE_DIR / 'src' / template
                 shutil.copy(template_src, src)
 
         with (src / componentsjs.name[:-3]).open('w') as f:  # type: ignore
             f.write(
                 componentsjs.render(
-                    imports=imports, socketio=self._socketio_path, components=components
+                    imports=imports,
+                    socketio=self._socketio_path,
+                    components=components,
+                    websocket=self._server.message_queue is not None,
+                    limits=jdumps(
+                        {event.signal: limit.to_json() for event, limit in self._limits.items()}
+                    ),
                 )
             )
 
@@ -963,7 +1231,7 @@ class App:
 
         for filename in ['package.json', 'webpack.prod.js', 'webpack.dev.js']:
             if not (self._build_dir / filename).is_file():
-                sourcefile = self._package_dir / 'src' / filename
+                sourcefile = _PACKAGE_DIR / 'src' / filename
                 shutil.copy(sourcefile, self._build_dir)
 
         if self._run(['yarn', '--ignore-engines', 'install'], notebook=notebook) > 1:
@@ -985,6 +1253,12 @@ class App:
         if retval != 0:
             raise WebpackError('Error building with webpack')
 
+    def _record(self, event: Event) -> Callable:
+        def record(data):
+            self._mirror.record(request.sid, event.uuid, event.getter, unpack(data))
+
+        return record
+
     def _endpoints(self) -> None:
         def generate_sio_handler(main_event: Event, supports) -> Callable:
             # get all events from all subscriptions associated with this event
@@ -1001,37 +1275,73 @@ class App:
                     )
 
             def handler(*args):
+                # if there is no getter, then there is no data to unpack
+                # if there is a getter, then we need to unpack the data sent
+                main_getter = main_event.getter
+                if main_getter is not None:
+                    data = unpack(args[0])
+                    if self._mirror is not None:
+                        self._mirror.record(request.sid, main_event.uuid, main_getter, data)
+                # order the events now, fetching their data may finish out of order
+                tickets = {
+                    func: self._latest.ticket(request.sid, func)
+                    for _, func in supports
+                    if func in self._latest_funcs
+                }
+
                 def wrapuser():
-                    event_data = {}
-                    for event in uniq_events:
-                        comp = COMPONENT_REGISTRY[event.uuid]
-                        # we already checked that this component has a getter
-                        event_data[event.signal] = getattr(comp, event.getter)()
-
-                    # if there is no getter, then there is no data to unpack
-                    # if there is a getter, then we need to unpack the data sent
-                    main_getter = main_event.getter
+                    # we already checked that these components have a getter,
+                    # ask for all of them in one round trip
+                    event_data = get_many(uniq_events)
+
                     if main_getter is not None:
                         comp = COMPONENT_REGISTRY[main_event.uuid]
-                        event_data[main_event.signal] = getattr(comp, '_' + main_getter)(
-                            msgpack.unpackb(args[0], encoding='utf8')
-                        )
+                        event_data[main_event.signal] = getattr(comp, '_' + main_getter)(data)
 
                     # gather the remaining data from the other events through their getter methods
                     for events, func in supports:
                         if main_getter is not None:
-                            func(*(event_data[event.signal] for event in events))
+                            call = partial(func, *(event_data[event.signal] for event in events))
+                        else:
+                            call = func
+                        if func in tickets:
+                            self._latest.run(
+                                request.sid,
+                                func,
+                                tickets[func],
+                                copy_current_request_context(call),
+                            )
                         else:
-                            func()
+                            call()
 
                 # TODO replace with flask socketio start_background_task
-                eventlet.spawn(copy_current_request_context(wrapuser))
+                limit = self._limits.get(main_event)
+                if limit is None:
+                    eventlet.spawn(copy_current_request_context(wrapuser))
+                else:
+                    limit(request.sid, copy_current_request_context(wrapuser))
 
             return handler
 
+        if self._mirror is not None:
+            # the browser holds back limited events so the mirror would fall behind
+            for event in self._limits:
+                if event.getter is not None:
+                    self._mirror.ignore(event.uuid, event.getter)
+
         for event, supports in self._subscriptions.items():
             self._socketio.on(event.signal)(generate_sio_handler(event, supports))
 
+        if self._mirror is not None:
+            # mirror the state of components nobody subscribed to as well
+            for component in COMPONENT_REGISTRY.values():
+                for name in dir(type(component)):
+                    if not is_event(name):
+                        continue
+                    event = getattr(component, name)
+                    if event.getter is not None and event not in self._subscriptions:
+                        self._socketio.on(event.signal)(self._record(event))
+
         if self._init is not None:
             self._socketio.on('INITIALIZE')(
                 lambda: eventlet.spawn(copy_current_request_context(self._init))
@@ -1058,42 +1368,50 @@ class App:
                 lambda: eventlet.spawn(copy_current_request_context(func))
             )
 
-        # bundle route
+        # pylint: disable=protected-access
+        for uuid, component in COMPONENT_REGISTRY.items():
+            for name, message_handler in component._handlers().items():
+                self._socketio.on(f'{uuid}{SEPARATOR}{name}')(message_handler)
+
+        for route in self._routes:
+            self._views.add(
+                route.view._uuid, [component._uuid for component in route.view._components]
+            )
+
+        self._server.connect(self._disconnect)
+
+        self._assets.load('bundle.js')
+        self._chunks.preload()
+
+        # the page links the bundle with its version so it can be cached for good
         @self.app.route('/bowtie/bundle.js')
         def bowtiebundlejs():  # pylint: disable=unused-variable
-            bundle_path = self.app.root_path + '/build/bundle.js'
-            bundle_path_gz = bundle_path + '.gz'
-
-            try:
-                if os.path.getmtime(bundle_path) > os.path.getmtime(bundle_path_gz):
-                    return open(bundle_path, 'r').read()
-                bundle = open(bundle_path_gz, 'rb').read()
-                response = flask.make_response(bundle)
-                response.headers['content-encoding'] = 'gzip'
-                response.headers['vary'] = 'accept-encoding'
-                response.headers['content-length'] = len(response.data)
-                return response
-            except FileNotFoundError:
-                if os.path.isfile(bundle_path_gz):
-                    bundle = open(bundle_path_gz, 'rb').read()
-                    response = flask.make_response(bundle)
-                    response.headers['Content-Encoding'] = 'gzip'
-                    response.headers['Vary'] = 'Accept-Encoding'
-                    response.headers['Content-Length'] = len(response.data)
-                    return response
-                return open(bundle_path, 'r').read()
-
-        for schedule in self._schedules:
-            schedule.start()
-
-    def _serve(self, host='0.0.0.0', port=9991) -> None:
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        result = sock.connect_ex((host, port))
-        if result == 0:
-            raise Exception(f'Port {port} is unavailable on host {host}, aborting.')
-        self._socketio.run(self.app, host=host, port=port)
-        for schedule in self._schedules:
-            schedule.stop()
+            version = self._assets.version('bundle.js')
+            return self._assets.response('bundle.js', immutable=request.args.get('v') == version)
+
+        # chunks have content hashed names so they never change
+        @self.app.route('/bowtie/chunks/<name>')
+        def bowtiechunk(name):  # pylint: disable=unused-variable
+            return self._chunks.response(name)
+
+    def _disconnect(self, sid: str) -> None:
+        """Forget what the app keeps for a client that disconnected."""
+        if self._mirror is not None:
+            self._mirror.disconnect(sid)
+        if self._cache is not None:
+            self._cache.disconnect(sid)
+        for limit in self._limits.values():
+            limit.disconnect(sid)
+        self._latest.disconnect(sid)
+        for component in COMPONENT_REGISTRY.values():
+            component._disconnect(sid)  # pylint: disable=protected-access
+
+    def _prepare(self) -> None:
+        """Register the endpoints and start the scheduled functions once."""
+        self._server.prepare(self._endpoints)
+
+    def _serve(self, host='0.0.0.0', port=9991, workers: int = 1) -> None:
+        self._server.serve(self.app, self._endpoints, host=host, port=port, workers=workers)
 
     def _installed_packages(self) -> Generator[str, None, None]:
         """Extract installed packages as list from `package.json`."""
@@ -0,0 +1,136 @@
+"""Serve the compiled javascript from memory."""
+
+from typing import Dict, Optional  # pylint: disable=unused-import
+from collections import namedtuple
+from pathlib import Path
+import gzip
+import hashlib
+import mimetypes
+
+import flask
+from werkzeug.exceptions import NotFound
+
+# preferred first
+ENCODINGS = 'br', 'gzip'
+SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+IMMUTABLE = 'public, max-age=31536000, immutable'
+REVALIDATE = 'no-cache'
+
+
+# contents of a file in each encoding
+Asset = namedtuple('Asset', ['version', 'mimetype', 'mtime', 'variants'])
+
+
+def _compress(data: bytes, encoding: str) -> Optional[bytes]:
+    # fast enough for a development bundle, production builds come compressed
+    if encoding == 'gzip':
+        return gzip.compress(data, compresslevel=6)
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli.compress(data, quality=5)
+
+
+class Assets:
+    """Files loaded into memory once with their compressed variants.
+
+    Each file is read with the ``.br`` and ``.gz`` files built next to it,
+    missing variants are compressed in memory, brotli only if it's installed.
+    Responses negotiate the encoding from ``Accept-Encoding``, carry an ETag
+    of the content and answer conditional requests with 304.
+    """
+
+    def __init__(self, directory: Path, reload: bool = False) -> None:
+        """Create an empty store.
+
+        Parameters
+        ----------
+        directory : Path
+            Directory of the files.
+        reload : bool, optional
+            Check the modification time on each request and read changed files again,
+            for development.
+
+        """
+        self.directory = directory
+        self.reload = reload
+        self._assets = {}  # type: Dict[str, Asset]
+
+    def load(self, name: str) -> Optional[Asset]:
+        """Read a file unless it's already loaded, None if it doesn't exist."""
+        path = self.directory / name
+        asset = self._assets.get(name)
+        if asset is not None and not self.reload:
+            return asset
+        if not path.is_file():
+            self._assets.pop(name, None)
+            return None
+        mtime = path.stat().st_mtime
+        if asset is not None and asset.mtime == mtime:
+            return asset
+
+        data = path.read_bytes()
+        variants = {'identity': data}
+        for encoding in ENCODINGS:
+            compressed = path.with_name(path.name + SUFFIXES[encoding])
+            if compressed.is_file() and compressed.stat().st_mtime >= mtime:
+                variants[encoding] = compressed.read_bytes()
+            else:
+                variant = _compress(data, encoding)
+                if variant is not None:
+                    variants[encoding] = variant
+        asset = Asset(
+            version=hashlib.sha1(data).hexdigest()[:20],
+            mimetype=mimetypes.guess_type(name)[0] or 'application/octet-stream',
+            mtime=mtime,
+            variants=variants,
+        )
+        self._assets[name] = asset
+        return asset
+
+    def preload(self, pattern: str = '*.js') -> None:
+        """Load the matching files."""
+        for path in self.directory.glob(pattern):
+            self.load(path.name)
+
+    def version(self, name: str) -> str:
+        """Content hash of a file, empty if it doesn't exist."""
+        asset = self.load(name)
+        return '' if asset is None else asset.version
+
+    def response(self, name: str, immutable: bool = True) -> flask.Response:
+        """Respond to a request for a file.
+
+        Parameters
+        ----------
+        name : str
+            File name relative to the directory.
+        immutable : bool, optional
+            Let browsers cache the file for good, only for urls that change with the content.
+            Otherwise browsers revalidate it with the ETag.
+
+        """
+        # file names come from the url
+        asset = self.load(name) if Path(name).name == name else None
+        if asset is None:
+            raise NotFound()
+
+        accepted = flask.request.accept_encodings
+        variants = asset.variants
+        encoding = next(
+            (encoding for encoding in ENCODINGS if encoding in variants and accepted[encoding]),
+            'identity',
+        )
+        etag = asset.version if encoding == 'identity' else f'{asset.version}-{encoding}'
+        headers = {
+            'ETag': f'"{etag}"',
+            'Cache-Control': IMMUTABLE if immutable else REVALIDATE,
+            'Vary': 'Accept-Encoding',
+        }
+        if flask.request.if_none_match.contains(etag):
+            return flask.Response(status=304, headers=headers)
+
+        if encoding != 'identity':
+            headers['Content-Encoding'] = encoding
+        return flask.Response(variants[encoding], mimetype=asset.mimetype, headers=headers)
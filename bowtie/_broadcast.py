@@ -0,0 +1,109 @@
+"""Encode a message once and send it to many clients.
+
+Socket.io has no public API for this, it relies on these internals:
+``socketio.Server._emit_internal``, ``engineio.Server._get_socket``,
+``engineio.socket.Socket.send`` and ``socketio.BaseManager.rooms``.
+It's only used with ``App(encode_once=True)``, ``test_broadcast`` checks they still exist.
+"""
+
+from typing import Any, List, Optional, Union  # pylint: disable=unused-import
+
+from engineio import packet as eio_packet
+import socketio
+from socketio import packet as sio_packet
+
+
+class _Encoded(eio_packet.Packet):
+    """Engine.io packet that reuses its encoding for every client."""
+
+    def __init__(self, data: Union[str, bytes], binary: bool) -> None:
+        super().__init__(eio_packet.MESSAGE, data=data, binary=binary)
+        self._encoded = {}  # type: dict
+
+    def encode(self, b64=False, always_bytes=True):
+        """Encode the packet the first time it's sent with these options."""
+        key = b64, always_bytes
+        if key not in self._encoded:
+            self._encoded[key] = super().encode(b64=b64, always_bytes=always_bytes)
+        return self._encoded[key]
+
+
+def encode(event: str, data: Any, namespace: str = '/') -> List[_Encoded]:
+    """Encode a socket.io event into engine.io packets.
+
+    Binary data is sent as attachments following the event packet.
+    """
+    encoded = sio_packet.Packet(sio_packet.EVENT, namespace=namespace, data=[event, data]).encode()
+    if not isinstance(encoded, list):
+        encoded = [encoded]
+    return [_Encoded(part, binary=i > 0) for i, part in enumerate(encoded)]
+
+
+def broadcast(
+    server,
+    event: str,
+    data: Any,
+    namespace: Optional[str] = None,
+    room: Optional[str] = None,
+    skip_sid: Optional[Union[str, List[str]]] = None,
+) -> None:
+    """Send an event to a room, encoding it only once.
+
+    Socket.io would build and encode the packets again for each client,
+    copying the payload every time. Here the same packets are queued on every socket.
+
+    Parameters
+    ----------
+    server : socketio.Server
+    event : str
+        Socket.io message name.
+    data : any
+        Message data.
+    namespace : str, optional
+    room : str, optional
+        Room or session id, all clients by default.
+    skip_sid : str or list of str, optional
+        Clients that don't receive the event.
+
+    """
+    namespace = namespace or '/'
+    manager = server.manager
+    if namespace not in manager.rooms or room not in manager.rooms[namespace]:
+        return
+    if skip_sid is None:
+        skipped = []  # type: List[str]
+    elif isinstance(skip_sid, list):
+        skipped = skip_sid
+    else:
+        skipped = [skip_sid]
+    sids = [sid for sid in manager.get_participants(namespace, room) if sid not in skipped]
+    if len(sids) < 2:
+        # nothing to share
+        for sid in sids:
+            server._emit_internal(sid, event, data, namespace)  # pylint: disable=protected-access
+        return
+
+    packets = encode(event, data, namespace)
+    for sid in sids:
+        try:
+            sock = server.eio._get_socket(sid)  # pylint: disable=protected-access
+        except KeyError:
+            # it disconnected
+            continue
+        for pkt in packets:
+            sock.send(pkt)
+
+
+class BroadcastManager(socketio.BaseManager):
+    """Client manager that encodes messages sent to several clients once."""
+
+    def emit(  # pylint: disable=too-many-arguments
+        self, event, data, namespace, room=None, skip_sid=None, callback=None, **kwargs
+    ):
+        """Send an event, see ``socketio.BaseManager.emit``."""
+        if callback is not None:
+            # each client needs its own ack id
+            return super().emit(
+                event, data, namespace, room=room, skip_sid=skip_sid, callback=callback, **kwargs
+            )
+        return broadcast(self.server, event, data, namespace, room, skip_sid)
@@ -1,12 +1,32 @@
 """Bowtie cache functions."""
 
+from typing import (  # pylint: disable=unused-import
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+    cast,
+)
+from abc import ABCMeta, abstractmethod
+from collections import OrderedDict
+import hashlib
+import os
+from pathlib import Path
+import shutil
+import struct
+import tempfile
+import time
+import warnings
+
 import flask
-from flask_socketio import emit
 import eventlet
 from eventlet.queue import LightQueue
-import msgpack
 
-from bowtie._component import pack
+from bowtie._component import client_emit, pack, unpack, session_id
 
 
 def validate(key):
@@ -18,12 +38,301 @@ def validate(key):
         raise KeyError('Key must be of type str or bytes, found type {}'.format(type(key)))
 
 
-# pylint: disable=too-few-public-methods
+def _normalize(key: Union[str, bytes]) -> str:
+    """Treat str and bytes keys the same, like the browser does."""
+    if isinstance(key, bytes):
+        return key.decode('utf8')
+    return key
+
+
+class CacheBackend(metaclass=ABCMeta):
+    """Where the cache stores its data.
+
+    Values are packed before they're saved so backends only deal with bytes.
+    Each client has its own namespace identified by its session id,
+    ``None`` is used outside of a request, e.g. in scheduled functions.
+    """
+
+    @abstractmethod
+    def load_many(self, sid: Optional[str], keys: List[str]) -> List[Optional[bytes]]:
+        """Load the packed values, None for keys that don't exist or expired."""
+
+    @abstractmethod
+    def save_many(
+        self, sid: Optional[str], items: Mapping[str, bytes], ttl: Optional[float] = None
+    ) -> None:
+        """Save the packed values, they expire after ``ttl`` seconds if given."""
+
+    @abstractmethod
+    def delete(self, sid: Optional[str], keys: List[str]) -> None:
+        """Delete the keys if they exist."""
+
+    @abstractmethod
+    def keys(self, sid: Optional[str]) -> List[str]:
+        """List the keys that haven't expired."""
+
+    def load(self, sid: Optional[str], key: str) -> Optional[bytes]:
+        """Load the packed value, None if it doesn't exist or expired."""
+        return self.load_many(sid, [key])[0]
+
+    def save(self, sid: Optional[str], key: str, data: bytes, ttl: Optional[float] = None) -> None:
+        """Save the packed value, it expires after ``ttl`` seconds if given."""
+        self.save_many(sid, {key: data}, ttl)
+
+    def disconnect(self, sid: str) -> None:
+        """Forget a client that disconnected."""
+
+
+def _browser_ask(signal: str, message: Dict[str, Any]) -> Any:
+    event = LightQueue(1)
+    client_emit(signal, message, callback=event.put)
+    return event.get(timeout=10)
+
+
+class BrowserCache(CacheBackend):
+    """Store data in the browser's session storage.
+
+    Every call is a message to the browser, loading waits for its response.
+    Data stays in the browser until the tab is closed.
+    """
+
+    def load_many(self, sid: Optional[str], keys: List[str]) -> List[Optional[bytes]]:
+        """Ask the browser for the packed values."""
+        values = _browser_ask('cache_load', {'keys': pack(keys)})
+        return [None if value is None else bytes(value) for value in values]
+
+    def save_many(
+        self, sid: Optional[str], items: Mapping[str, bytes], ttl: Optional[float] = None
+    ) -> None:
+        """Send the packed values to the browser."""
+        client_emit(
+            'cache_save', {'keys': pack(list(items)), 'data': list(items.values()), 'ttl': ttl}
+        )
+        eventlet.sleep()
+
+    def delete(self, sid: Optional[str], keys: List[str]) -> None:
+        """Delete the keys from the browser."""
+        client_emit('cache_delete', {'keys': pack(keys)})
+        eventlet.sleep()
+
+    def keys(self, sid: Optional[str]) -> List[str]:
+        """Ask the browser for its keys."""
+        return cast(List[str], unpack(bytes(_browser_ask('cache_keys', {}))))
+
+
+class MemoryCache(CacheBackend):
+    """Store data in the server's memory.
+
+    Each client has its own least recently used cache,
+    the oldest values are dropped once it holds more than ``max_bytes``.
+    Data is dropped when the client disconnects.
+
+    Examples
+    --------
+    >>> from bowtie import App, MemoryCache
+    >>> app = App(cache=MemoryCache(max_bytes=2 ** 20))
+
+    """
+
+    def __init__(self, max_bytes: int = 64 * 2 ** 20) -> None:
+        """Create an empty cache.
+
+        Parameters
+        ----------
+        max_bytes : int, optional
+            Maximum size of the packed values stored for each client.
+
+        """
+        self.max_bytes = max_bytes
+        # values are stored with the monotonic time they expire
+        self._sessions = {}  # type: Dict[Optional[str], OrderedDict]
+        self._sizes = {}  # type: Dict[Optional[str], int]
+
+    def _pop(self, sid: Optional[str], key: str) -> None:
+        data, _ = self._sessions[sid].pop(key)
+        self._sizes[sid] -= len(data)
+
+    def load_many(self, sid: Optional[str], keys: List[str]) -> List[Optional[bytes]]:
+        """Load the packed values and mark them as recently used."""
+        values = self._sessions.get(sid, OrderedDict())
+        now = time.monotonic()
+        loaded = []  # type: List[Optional[bytes]]
+        for key in keys:
+            if key not in values:
+                loaded.append(None)
+                continue
+            data, expires = values[key]
+            if expires is not None and expires <= now:
+                self._pop(sid, key)
+                loaded.append(None)
+            else:
+                values.move_to_end(key)
+                loaded.append(data)
+        return loaded
+
+    def save_many(
+        self, sid: Optional[str], items: Mapping[str, bytes], ttl: Optional[float] = None
+    ) -> None:
+        """Save the packed values, dropping the least recently used values if it's full.
+
+        A value larger than ``max_bytes`` isn't stored and a warning is issued,
+        the key's previous value is removed.
+        """
+        values = self._sessions.setdefault(sid, OrderedDict())
+        self._sizes.setdefault(sid, 0)
+        expires = None if ttl is None else time.monotonic() + ttl
+        for key, data in items.items():
+            if key in values:
+                self._pop(sid, key)
+            if len(data) > self.max_bytes:
+                warnings.warn(
+                    'Not caching "{}", its {} bytes exceed max_bytes={}.'.format(
+                        key, len(data), self.max_bytes
+                    )
+                )
+                continue
+            values[key] = data, expires
+            self._sizes[sid] += len(data)
+        while self._sizes[sid] > self.max_bytes and values:
+            self._pop(sid, next(iter(values)))
+
+    def delete(self, sid: Optional[str], keys: List[str]) -> None:
+        """Delete the keys if they exist."""
+        values = self._sessions.get(sid, OrderedDict())
+        for key in keys:
+            if key in values:
+                self._pop(sid, key)
+
+    def keys(self, sid: Optional[str]) -> List[str]:
+        """List the keys that haven't expired."""
+        now = time.monotonic()
+        return [
+            key
+            for key, (_, expires) in self._sessions.get(sid, {}).items()
+            if expires is None or expires > now
+        ]
+
+    def disconnect(self, sid: str) -> None:
+        """Drop the client's data."""
+        self._sessions.pop(sid, None)
+        self._sizes.pop(sid, None)
+
+
+class DiskCache(CacheBackend):
+    """Store data in files on the server.
+
+    Every worker on the machine sees the same files,
+    so it can be shared by several server processes.
+    Each client gets its own directory which is removed when it disconnects.
+
+    Examples
+    --------
+    >>> from bowtie import App, DiskCache
+    >>> app = App(cache=DiskCache('/tmp/bowtie'))
+
+    """
+
+    # each file starts with the time it expires, zero if it never expires,
+    # followed by the key's length and the key
+    _HEADER = struct.Struct('<dI')
+
+    def __init__(self, directory: Union[str, Path]) -> None:
+        """Create a cache in a directory.
+
+        Parameters
+        ----------
+        directory : str or Path
+            Directory for the cache, it's created if it doesn't exist.
+
+        """
+        self.directory = Path(directory)
+
+    def _session(self, sid: Optional[str]) -> Path:
+        return self.directory / (sid or '_')
+
+    def _path(self, sid: Optional[str], key: str) -> Path:
+        return self._session(sid) / hashlib.sha1(key.encode('utf8')).hexdigest()
+
+    def _read(self, path: Path) -> Optional[Tuple[str, bytes]]:
+        """Read the key and packed value from a file, None if it doesn't exist or expired."""
+        try:
+            contents = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        expires, length = self._HEADER.unpack_from(contents)
+        if expires and expires <= time.time():
+            path.unlink()
+            return None
+        header = self._HEADER.size
+        start = header + length
+        return contents[header:start].decode('utf8'), contents[start:]
+
+    def load_many(self, sid: Optional[str], keys: List[str]) -> List[Optional[bytes]]:
+        """Read the packed values from their files."""
+        loaded = []  # type: List[Optional[bytes]]
+        for key in keys:
+            contents = self._read(self._path(sid, key))
+            loaded.append(None if contents is None else contents[1])
+        return loaded
+
+    def save_many(
+        self, sid: Optional[str], items: Mapping[str, bytes], ttl: Optional[float] = None
+    ) -> None:
+        """Write the packed values to their files."""
+        self._session(sid).mkdir(parents=True, exist_ok=True)
+        expires = 0.0 if ttl is None else time.time() + ttl
+        for key, data in items.items():
+            path = self._path(sid, key)
+            name = key.encode('utf8')
+            # write then rename so readers never see a partial file,
+            # each writer gets its own temporary file
+            with tempfile.NamedTemporaryFile(
+                dir=str(path.parent), suffix='.tmp', delete=False
+            ) as tmp:
+                tmp.write(self._HEADER.pack(expires, len(name)) + name + data)
+            os.replace(tmp.name, str(path))
+
+    def delete(self, sid: Optional[str], keys: List[str]) -> None:
+        """Remove the files of the keys."""
+        for key in keys:
+            try:
+                self._path(sid, key).unlink()
+            except FileNotFoundError:
+                pass
+
+    def keys(self, sid: Optional[str]) -> List[str]:
+        """List the keys that haven't expired."""
+        session = self._session(sid)
+        if not session.is_dir():
+            return []
+        keys = []
+        for path in session.iterdir():
+            if path.suffix == '.tmp':
+                continue
+            contents = self._read(path)
+            if contents is not None:
+                keys.append(contents[0])
+        return keys
+
+    def disconnect(self, sid: str) -> None:
+        """Remove the client's directory."""
+        shutil.rmtree(self._session(sid), ignore_errors=True)
+
+
+_BROWSER = BrowserCache()
+
+
+def _backend() -> CacheBackend:
+    return flask.current_app.extensions.get('bowtie.cache', _BROWSER)
+
+
 class _Cache:
-    """Store data in the browser.
+    """Store data for each client.
 
-    This cache uses session storage so data will stay
-    in the browser until the tab is closed.
+    By default the data is stored in the browser's session storage
+    so it will stay in the browser until the tab is closed.
+    Pass ``cache=MemoryCache()`` or ``cache=DiskCache(directory)`` to ``App``
+    to keep the data on the server instead, which saves a round trip to the browser.
     All data must be serializable, which means if the
     serialization transforms the data it won't be the same
     when it is fetched.
@@ -36,7 +345,13 @@ class _Cache:
     True
     >>> cache['b'] = np.arange(5)  # doctest: +SKIP
     >>> cache['b']  # doctest: +SKIP
-    [1, 2, 3, 4, 5]
+    [0, 1, 2, 3, 4]
+
+    Several values can be loaded or stored in one round trip.
+
+    >>> cache.set_many({'c': 1, 'd': 2}, ttl=60)  # doctest: +SKIP
+    >>> cache.get_many(['c', 'd', 'e'])  # doctest: +SKIP
+    {'c': 1, 'd': 2, 'e': None}
 
     """
 
@@ -55,14 +370,10 @@ class _Cache:
 
         """
         validate(key)
-        signal = 'cache_load'
-        event = LightQueue(1)
-        if flask.has_request_context():
-            emit(signal, {'data': pack(key)}, callback=event.put)
-        else:
-            sio = flask.current_app.extensions['socketio']
-            sio.emit(signal, {'data': pack(key)}, callback=event.put)
-        return msgpack.unpackb(bytes(event.get(timeout=10)), encoding='utf8')
+        data = _backend().load(session_id(), _normalize(key))
+        if data is None:
+            return None
+        return unpack(data)
 
     def __setitem__(self, key, value):
         """Store the key value pair.
@@ -79,14 +390,91 @@ class _Cache:
         None
 
         """
+        self.set(key, value)
+
+    def __delitem__(self, key):
+        """Delete the key."""
+        self.delete(key)
+
+    def __contains__(self, key):
+        """Check if the key exists and hasn't expired."""
         validate(key)
-        signal = 'cache_save'
-        if flask.has_request_context():
-            emit(signal, {'key': pack(key), 'data': pack(value)})
-        else:
-            sio = flask.current_app.extensions['socketio']
-            sio.emit(signal, {'key': pack(key), 'data': pack(value)})
-        eventlet.sleep()
+        return _backend().load(session_id(), _normalize(key)) is not None
+
+    def set(self, key, value, ttl: Optional[float] = None) -> None:
+        """Store the key value pair.
+
+        Parameters
+        ----------
+        key : str
+            The key to determine where it's stored, you'll need this to load the value later.
+        value : object
+            The value to store in the cache.
+        ttl : float, optional
+            Seconds until the value expires, by default it never expires.
+
+        """
+        validate(key)
+        _backend().save(session_id(), _normalize(key), pack(value), ttl)
+
+    def get_many(self, keys: Iterable) -> Dict[Any, Any]:
+        """Load the values of several keys at once.
+
+        Parameters
+        ----------
+        keys : iterable of str
+            The keys to lookup.
+
+        Returns
+        -------
+        dict
+            Values keyed by the given keys, None for keys that don't exist.
+
+        """
+        keys = list(keys)
+        for key in keys:
+            validate(key)
+        loaded = _backend().load_many(session_id(), [_normalize(key) for key in keys])
+        return {key: None if data is None else unpack(data) for key, data in zip(keys, loaded)}
+
+    def set_many(self, mapping: Mapping, ttl: Optional[float] = None) -> None:
+        """Store several key value pairs at once.
+
+        Parameters
+        ----------
+        mapping : dict
+            Key value pairs to store.
+        ttl : float, optional
+            Seconds until the values expire, by default they never expire.
+
+        """
+        for key in mapping:
+            validate(key)
+        items = {_normalize(key): pack(value) for key, value in mapping.items()}
+        _backend().save_many(session_id(), items, ttl)
+
+    def delete(self, *keys) -> None:
+        """Delete keys, keys that don't exist are ignored.
+
+        Parameters
+        ----------
+        *keys : str
+            The keys to delete.
+
+        """
+        for key in keys:
+            validate(key)
+        _backend().delete(session_id(), [_normalize(key) for key in keys])
+
+    def keys(self) -> List[str]:
+        """List the keys stored that haven't expired.
+
+        Returns
+        -------
+        list of str
+
+        """
+        return _backend().keys(session_id())
 
 
 # pylint: disable=invalid-name
@@ -61,17 +61,19 @@ def command(func):
     @cmd.command(add_help_option=False)
     @click.option('--host', '-h', default='0.0.0.0', type=str)
     @click.option('--port', '-p', default=9991, type=int)
-    def run(host, port):
+    @click.option('--workers', '-w', default=1, type=int)
+    def run(host, port, workers):
         """Build the app and serve it."""
         app._build()
-        app._serve(host, port)
+        app._serve(host, port, workers)
 
     @cmd.command(add_help_option=True)
     @click.option('--host', '-h', default='0.0.0.0', type=str)
     @click.option('--port', '-p', default=9991, type=int)
-    def serve(host, port):
+    @click.option('--workers', '-w', default=1, type=int)
+    def serve(host, port, workers):
         """Serve the Bowtie app."""
-        app._serve(host, port)
+        app._serve(host, port, workers)
 
     @cmd.command(context_settings=dict(ignore_unknown_options=True), add_help_option=False)
     @click.argument('extra', nargs=-1, type=click.UNPROCESSED)
@@ -3,17 +3,29 @@
 All visual and control components inherit these.
 """
 
-from typing import Any, Callable, Optional, ClassVar, Tuple  # pylint: disable=unused-import
+from typing import (  # pylint: disable=unused-import
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    List,
+    Optional,
+    ClassVar,
+    Tuple,
+)
 from abc import ABCMeta, abstractmethod
+from contextlib import contextmanager
 import string
-from functools import wraps
+import sys
+from functools import wraps, singledispatch
 import json
 from datetime import datetime, date, time
 
 import msgpack
 import flask
-from flask_socketio import emit
 import eventlet
+import eventlet.corolocal
 from eventlet.queue import LightQueue
 
 from bowtie.exceptions import SerializationError
@@ -22,6 +34,24 @@ from bowtie._typing import JSON
 
 COMPONENT_REGISTRY = {}
 SEPARATOR = '#'
+BULK_GET = 'bulk_get'
+
+# msgpack-lite decodes these extension types into javascript typed arrays
+# https://github.com/kawanet/msgpack-lite#extension-types
+_TYPED_ARRAYS = {
+    'i1': 0x11,
+    'u1': 0x12,
+    'i2': 0x13,
+    'u2': 0x14,
+    'i4': 0x15,
+    'u4': 0x16,
+    'f4': 0x17,
+    'f8': 0x18,
+}
+_TYPED_DTYPES = {code: dtype for dtype, code in _TYPED_ARRAYS.items()}
+# half floats fit in a Float32Array without losing anything,
+# 64 bit integers have no exact typed array msgpack-lite decodes so they're sent as lists
+_UPCAST = {'f2': 'f4'}
 
 
 class Event:
@@ -76,85 +106,302 @@ def jsnull(x: Any) -> Any:
     return x
 
 
-def json_conversion(obj: Any) -> JSON:
-    """Encode additional objects to JSON."""
-    try:
-        # numpy isn't an explicit dependency of bowtie
-        # so we can't assume it's available
-        import numpy as np
+class _Encoders:
+    """Convert objects the serializer doesn't understand by type dispatch.
 
-        if isinstance(obj, (np.ndarray, np.generic)):
-            return obj.tolist()
-    except ImportError:
-        pass
+    Encoders registered by users take precedence over the built-in ones,
+    which are only used for types no user encoder applies to.
+    The encoder for a type is resolved through its base classes the first
+    time the type is seen, after that it's a dictionary lookup on the exact type.
+    """
 
-    try:
-        # pandas isn't an explicit dependency of bowtie
-        # so we can't assume it's available
-        import pandas as pd
+    def __init__(self, default: Callable[[Any], Any]) -> None:
+        self._user = singledispatch(_no_encoder)
+        self._builtin = singledispatch(default)
+        self._cache = {}  # type: Dict[type, Callable[[Any], Any]]
 
-        if isinstance(obj, pd.DatetimeIndex):
-            return [x.isoformat() for x in obj.to_pydatetime()]
-        if isinstance(obj, pd.Index):
-            return obj.tolist()
-        if isinstance(obj, pd.Series):
-            try:
-                return [x.isoformat() for x in obj.dt.to_pydatetime()]
-            except AttributeError:
-                return obj.tolist()
-    except ImportError:
-        pass
+    def register(self, cls: type, encoder: Callable[[Any], Any]) -> None:
+        """Use ``encoder`` for objects of type ``cls`` and its subclasses."""
+        self._user.register(cls, encoder)
+        self._cache.clear()
 
-    if isinstance(obj, (datetime, time, date)):
-        return obj.isoformat()
+    def register_builtin(self, cls: type, encoder: Callable[[Any], Any]) -> None:
+        """Use ``encoder`` for ``cls`` unless a user registered an encoder for it."""
+        self._builtin.register(cls, encoder)
+        self._cache.clear()
+
+    def __call__(self, obj: Any) -> JSON:
+        """Encode ``obj``."""
+        cls = type(obj)
+        encoder = self._cache.get(cls)
+        if encoder is None:
+            _register_optional()
+            encoder = self._user.dispatch(cls)
+            if encoder is _no_encoder:
+                encoder = self._builtin.dispatch(cls)
+            self._cache[cls] = encoder
+        return encoder(obj)
+
+
+def _no_encoder(obj: Any) -> JSON:
+    raise NotImplementedError
+
+
+def _unknown(obj: Any) -> JSON:
     raise TypeError('Not sure how to serialize {} of type {}'.format(obj, type(obj)))
 
 
-def jdumps(data: Any) -> str:
-    """Encode Python object to JSON with additional encoders."""
-    return json.dumps(data, default=json_conversion)
+# pylint: disable=invalid-name
+json_conversion = _Encoders(_unknown)
+"""Encode additional objects to JSON."""
 
+encoders = _Encoders(lambda obj: obj)
+"""Convert Python object to msgpack encodable ones."""
+# pylint: enable=invalid-name
 
-def encoders(obj: Any) -> JSON:  # pylint: disable=too-many-return-statements
-    """Convert Python object to msgpack encodable ones."""
-    try:
-        # numpy isn't an explicit dependency of bowtie
-        # so we can't assume it's available
-        import numpy as np
+DATETIME_FORMATS = ('iso', 'epoch')
+_EPOCH = datetime(1970, 1, 1)
+
+# msgpack and JSON encoders for each datetime format
+_REGISTRIES = {
+    'iso': (encoders, json_conversion),
+    'epoch': (_Encoders(lambda obj: obj), _Encoders(_unknown)),
+}
+
+
+# datetime format used by the current thread when it runs outside of the app
+_DEFAULTS = eventlet.corolocal.local()
 
-        if isinstance(obj, (np.ndarray, np.generic)):
-            # https://docs.scipy.org/doc/numpy/reference/arrays.scalars.html
-            return obj.tolist()
-    except ImportError:
-        pass
 
+@contextmanager
+def datetime_format(fmt: str) -> Generator[None, None, None]:
+    """Pack datetimes with this format in this block instead of the app's.
+
+    Parameters
+    ----------
+    fmt : str
+        "iso" or "epoch", usually the app's format
+        passed to a thread or process that runs a subscribed function.
+
+    """
+    previous = getattr(_DEFAULTS, 'datetime_format', None)
+    _DEFAULTS.datetime_format = fmt
     try:
-        # pandas isn't an explicit dependency of bowtie
-        # so we can't assume it's available
-        import pandas as pd
+        yield
+    finally:
+        _DEFAULTS.datetime_format = previous
+
+
+def _datetime_format(fmt: Optional[str]) -> str:
+    """Format given, the block's or the current app's, ISO 8601 otherwise."""
+    if fmt is None:
+        # a forked worker may have inherited the context of another app
+        fmt = getattr(_DEFAULTS, 'datetime_format', None)
+    if fmt is None:
+        if not flask.has_app_context():
+            return 'iso'
+        fmt = flask.current_app.extensions.get('bowtie.datetime_format', 'iso')
+    if fmt not in DATETIME_FORMATS:
+        raise ValueError(f'Datetime format must be one of {DATETIME_FORMATS}, found {fmt}.')
+    return fmt
+
+
+def jdumps(data: Any, datetime_format: Optional[str] = None) -> str:
+    """Encode Python object to JSON with additional encoders.
+
+    Parameters
+    ----------
+    data : any
+        Object to encode.
+    datetime_format : str, optional
+        ``'iso'`` or ``'epoch'``, see ``App``. The current app's format by default.
 
-        if isinstance(obj, pd.DatetimeIndex):
+    """
+    return json.dumps(data, default=_REGISTRIES[_datetime_format(datetime_format)][1])
+
+
+def typed_array(array: Any) -> Any:
+    """Encode a numeric numpy array as raw little-endian typed arrays.
+
+    One dimensional arrays become a single msgpack extension type,
+    higher dimensions become nested lists of them.
+    Arrays without a typed array equivalent, including 64 bit integers,
+    are converted to lists so their values are kept exactly.
+    """
+    dtype = '{}{}'.format(array.dtype.kind, array.dtype.itemsize)
+    dtype = _UPCAST.get(dtype, dtype)
+    if dtype not in _TYPED_ARRAYS or array.ndim == 0:
+        return array.tolist()
+    array = array.astype('<' + dtype, copy=False)
+    if array.ndim == 1:
+        return msgpack.ExtType(_TYPED_ARRAYS[dtype], array.tobytes())
+    return [typed_array(row) for row in array]
+
+
+def register_encoder(cls: type, encoder: Callable[[Any], Any]) -> None:
+    """Teach Bowtie how to serialize objects of type ``cls``.
+
+    This applies to data sent with commands and to component initialization.
+
+    Parameters
+    ----------
+    cls : type
+        Objects of this type, or subclasses of it, will be converted with ``encoder``.
+    encoder : callable
+        Converts the object into something that can be serialized,
+        e.g. a list, dict, str or number.
+
+    Examples
+    --------
+    >>> from fractions import Fraction
+    >>> register_encoder(Fraction, float)
+    >>> unpack(pack(Fraction(1, 4)))
+    0.25
+
+    """
+    for registries in _REGISTRIES.values():
+        for registry in registries:
+            registry.register(cls, encoder)
+
+
+def _isoformat(obj: Any) -> str:
+    return obj.isoformat()
+
+
+def _tolist(obj: Any) -> JSON:
+    return obj.tolist()
+
+
+def _epoch_datetime(obj: datetime) -> float:
+    if obj.tzinfo is None:
+        return (obj - _EPOCH).total_seconds() * 1000
+    return obj.timestamp() * 1000
+
+
+def _epoch_date(obj: date) -> float:
+    return _epoch_datetime(datetime.combine(obj, time()))
+
+
+def _register_builtin(cls: type, encoder: Callable[[Any], Any]) -> None:
+    for registries in _REGISTRIES.values():
+        for registry in registries:
+            registry.register_builtin(cls, encoder)
+
+
+_register_builtin(datetime, _isoformat)
+_register_builtin(date, _isoformat)
+_register_builtin(time, _isoformat)
+for _registry in _REGISTRIES['epoch']:
+    _registry.register_builtin(datetime, _epoch_datetime)
+    _registry.register_builtin(date, _epoch_date)
+
+
+def _datetime64(values: Any, encode: Callable[[Any], Any], fmt: str) -> JSON:
+    """Encode a numpy datetime64 array without converting each element."""
+    import numpy as np
+
+    if fmt == 'epoch':
+        return encode((values - np.datetime64(0, 's')) / np.timedelta64(1, 'ms'))
+    seconds = values.astype('datetime64[s]')
+    if ((values == seconds) | np.isnat(values)).all():
+        # isoformat leaves out the fraction when there are no microseconds
+        return np.datetime_as_string(seconds).tolist()
+    return [
+        'NaT' if x is None else x.isoformat() for x in values.astype('datetime64[us]').tolist()
+    ]
+
+
+def _register_numpy() -> None:
+    import numpy as np
+
+    def array(encode, fmt):
+        def encode_array(obj):
+            if obj.dtype.kind == 'M':
+                return _datetime64(obj, encode, fmt)
+            return encode(obj)
+
+        return encode_array
+
+    def scalar(fmt):
+        # the same as an array of one
+        return lambda obj: _datetime64(np.array([obj]), _tolist, fmt)[0]
+
+    # https://docs.scipy.org/doc/numpy/reference/arrays.scalars.html
+    _register_builtin(np.generic, _tolist)
+    for fmt, (msgpack_registry, json_registry) in _REGISTRIES.items():
+        msgpack_registry.register_builtin(np.ndarray, array(typed_array, fmt))
+        json_registry.register_builtin(np.ndarray, array(_tolist, fmt))
+        msgpack_registry.register_builtin(np.datetime64, scalar(fmt))
+        json_registry.register_builtin(np.datetime64, scalar(fmt))
+
+
+def _register_pandas() -> None:
+    import numpy as np
+    import pandas as pd
+
+    def datetimes(encode, fmt):
+        def encode_index(obj):
+            if obj.tz is None:
+                return _datetime64(obj.values, encode, fmt)
+            if fmt == 'epoch':
+                return _datetime64(obj.tz_convert(None).values, encode, fmt)
             return [x.isoformat() for x in obj.to_pydatetime()]
-        if isinstance(obj, pd.Index):
-            return obj.tolist()
-        if isinstance(obj, pd.Series):
-            try:
-                return [x.isoformat() for x in obj.dt.to_pydatetime()]
-            except AttributeError:
-                return obj.tolist()
-    except ImportError:
-        pass
 
-    if isinstance(obj, (datetime, time, date)):
-        return obj.isoformat()
+        return encode_index
+
+    def series(encode, fmt):
+        encode_index = datetimes(encode, fmt)
+
+        def encode_series(obj):
+            if obj.dtype.kind == 'M':
+                return encode_index(pd.DatetimeIndex(obj))
+            return encode(np.asarray(obj))
 
-    return obj
+        return encode_series
 
+    def index(encode):
+        return lambda obj: encode(np.asarray(obj))
 
-def pack(x: Any) -> bytes:
-    """Encode ``x`` into msgpack with additional encoders."""
+    for fmt, registries in _REGISTRIES.items():
+        for registry, encode in zip(registries, (typed_array, _tolist)):
+            registry.register_builtin(pd.DatetimeIndex, datetimes(encode, fmt))
+            registry.register_builtin(pd.Index, index(encode))
+            registry.register_builtin(pd.Series, series(encode, fmt))
+
+
+# numpy and pandas aren't explicit dependencies of bowtie
+# so their encoders are registered once something else has imported them
+_OPTIONAL = {'numpy': _register_numpy, 'pandas': _register_pandas}
+
+
+def _register_optional() -> None:
+    """Register encoders for optional libraries imported since the last call."""
+    for name in [name for name in _OPTIONAL if name in sys.modules]:
+        _OPTIONAL.pop(name)()
+
+
+def pack(x: Any, datetime_format: Optional[str] = None) -> bytes:
+    """Encode ``x`` into msgpack with additional encoders.
+
+    Parameters
+    ----------
+    x : any
+        Object to encode.
+    datetime_format : str, optional
+        ``'iso'`` sends ISO 8601 strings, ``'epoch'`` milliseconds since the Unix epoch.
+        The current app's format by default, ISO 8601 outside of an app.
+
+    Examples
+    --------
+    >>> unpack(pack(datetime(1970, 1, 2)))
+    '1970-01-02T00:00:00'
+    >>> unpack(pack(datetime(1970, 1, 2), datetime_format='epoch'))
+    86400000.0
+
+    """
+    default = _REGISTRIES[_datetime_format(datetime_format)][0]
     try:
-        return msgpack.packb(x, default=encoders)
+        return msgpack.packb(x, default=default)
     except TypeError as exc:
         message = (
             'Serialization error, check the data passed to a do_ command. '
@@ -163,9 +410,61 @@ def pack(x: Any) -> bytes:
         raise SerializationError(message)
 
 
+def decoders(code: int, data: bytes) -> Any:
+    """Convert msgpack extension types back into Python objects."""
+    if code in _TYPED_DTYPES:
+        import numpy as np
+
+        # copy so the array is writeable
+        return np.frombuffer(data, dtype='<' + _TYPED_DTYPES[code]).copy()
+    return msgpack.ExtType(code, data)
+
+
 def unpack(x: bytes) -> JSON:
     """Decode ``x`` from msgpack into Python object."""
-    return msgpack.unpackb(x, encoding='utf8')
+    return msgpack.unpackb(x, encoding='utf8', ext_hook=decoders)
+
+
+# session chosen with ``session`` for the current green thread
+_SESSION = eventlet.corolocal.local()
+
+
+def session_id() -> Optional[str]:
+    """Socket.io session id of the client being served.
+
+    None outside of a socket.io event unless a session was chosen with ``session``.
+    """
+    sid = getattr(_SESSION, 'sid', None)
+    if sid is not None:
+        return sid
+    if flask.has_request_context():
+        # plain http requests, e.g. uploads, don't have a session id
+        return getattr(flask.request, 'sid', None)
+    return None
+
+
+@contextmanager
+def session(sid: str) -> Generator[None, None, None]:
+    """Send commands, getters and cache requests in this block to one client.
+
+    Parameters
+    ----------
+    sid : str
+        Session id of the client.
+
+    """
+    previous = getattr(_SESSION, 'sid', None)
+    _SESSION.sid = sid
+    try:
+        yield
+    finally:
+        _SESSION.sid = previous
+
+
+def client_emit(signal: str, *args, callback: Optional[Callable] = None) -> None:
+    """Emit a message to the client being served, or every client if there isn't one."""
+    sio = flask.current_app.extensions['socketio']
+    sio.emit(signal, *args, room=session_id(), callback=callback)
 
 
 def make_event(event: Callable) -> Callable:
@@ -192,23 +491,77 @@ def is_event(attribute: str) -> bool:
     return attribute.startswith('on_')
 
 
+def ordered(command: Callable) -> Callable:
+    """Mark a command whose effect depends on the commands before it.
+
+    When commands are rate limited, ordered commands are all sent in order,
+    other commands are replaced by later calls of the same command.
+    """
+    command.ordered = True  # type: ignore
+    return command
+
+
+# commands sent by the current green thread are recorded while it's recording
+_RECORDERS = eventlet.corolocal.local()
+
+
+@contextmanager
+def recording(capture: bool = False) -> Generator[List[Tuple[int, str, bytes, bool]], None, None]:
+    """Record the commands sent in this block so they can be sent again with ``send``.
+
+    Parameters
+    ----------
+    capture : bool, optional
+        Only record the commands without sending them,
+        e.g. when running outside of the server's event loop.
+
+    """
+    recorders = getattr(_RECORDERS, 'stack', None)
+    if recorders is None:
+        recorders = _RECORDERS.stack = []
+    commands = []  # type: List[Tuple[int, str, bytes, bool]]
+    recorders.append(commands)
+    captured = _capturing()
+    _RECORDERS.capture = captured or capture
+    try:
+        yield commands
+    finally:
+        recorders.pop()
+        _RECORDERS.capture = captured
+
+
+def _capturing() -> bool:
+    return getattr(_RECORDERS, 'capture', False)
+
+
+def send(uuid: int, signal: str, data: bytes, coalesce: bool = True) -> None:
+    """Send a packed command to a component."""
+    for commands in getattr(_RECORDERS, 'stack', []):
+        commands.append((uuid, signal, data, coalesce))
+    if _capturing():
+        return
+    extensions = flask.current_app.extensions
+    mirror = extensions.get('bowtie.mirror')
+    if mirror is not None:
+        # the command may change the component's state
+        mirror.invalidate(session_id(), uuid)
+    extensions['bowtie.outbox'].send(signal, data, coalesce=coalesce)
+
+
 def make_command(command: Callable) -> Callable:
     """Create an command from a method signature."""
     # docstyle
+    coalesce = not getattr(command, 'ordered', False)
 
     @wraps(command)
     def actualcommand(self, *args, **kwds):  # pylint: disable=missing-docstring
         data = command(self, *args, **kwds)
         name = command.__name__[3:]
-        signal = '{uuid}{sep}{event}'.format(
-            uuid=self._uuid, sep=SEPARATOR, event=name  # pylint: disable=protected-access
-        )
-        if flask.has_request_context():
-            emit(signal, {'data': pack(data)})
-        else:
-            sio = flask.current_app.extensions['socketio']
-            sio.emit(signal, {'data': pack(data)})
-        eventlet.sleep()
+        uuid = self._uuid  # pylint: disable=protected-access
+        signal = '{uuid}{sep}{event}'.format(uuid=uuid, sep=SEPARATOR, event=name)
+        send(uuid, signal, pack(data), coalesce=coalesce)
+        if not _capturing():
+            eventlet.sleep()
 
     return actualcommand
 
@@ -224,16 +577,19 @@ def make_getter(getter: Callable) -> Callable:
 
     def get(self, timeout=10):  # pylint: disable=missing-docstring
         name = getter.__name__
-        signal = '{uuid}{sep}{event}'.format(
-            uuid=self._uuid, sep=SEPARATOR, event=name  # pylint: disable=protected-access
-        )
+        uuid = self._uuid  # pylint: disable=protected-access
+        mirror = flask.current_app.extensions.get('bowtie.mirror')
+        if mirror is not None:
+            try:
+                return getter(self, mirror.get(session_id(), uuid, name))
+            except KeyError:
+                pass
+        signal = '{uuid}{sep}{event}'.format(uuid=uuid, sep=SEPARATOR, event=name)
         event = LightQueue(1)
-        if flask.has_request_context():
-            emit(signal, callback=lambda x: event.put(unpack(x)))
-        else:
-            sio = flask.current_app.extensions['socketio']
-            sio.emit(signal, callback=lambda x: event.put(unpack(x)))
+        client_emit(signal, callback=lambda x: event.put(unpack(x)))
         data = event.get(timeout=timeout)
+        if mirror is not None:
+            mirror.record(session_id(), uuid, name, data)
         return getter(self, data)
 
     # don't want to copy the signature in this case
@@ -242,6 +598,61 @@ def make_getter(getter: Callable) -> Callable:
     return get
 
 
+def get_many(events: Iterable[Event], timeout: float = 10) -> Dict[str, Any]:
+    """Get the state of several components in one round trip.
+
+    State already mirrored on the server is used without asking the client.
+
+    Parameters
+    ----------
+    events : iterable of Event
+        Events with a getter.
+    timeout : float, optional
+        Seconds to wait for the client to respond.
+
+    Returns
+    -------
+    dict
+        Post-processed state keyed by the event's signal,
+        None for components that aren't mounted in the client.
+
+    """
+    sid = session_id()
+    mirror = flask.current_app.extensions.get('bowtie.mirror')
+    values = {}
+    missing = []
+    for event in events:
+        try:
+            values[event] = mirror.get(sid, event.uuid, event.getter)
+        except (AttributeError, KeyError):
+            missing.append(event)
+
+    unmounted = set()
+    if missing:
+        signals = [
+            '{uuid}{sep}{getter}'.format(uuid=event.uuid, sep=SEPARATOR, getter=event.getter)
+            for event in missing
+        ]
+        result = LightQueue(1)
+        client_emit(BULK_GET, pack(signals), callback=lambda x: result.put(unpack(x)))
+        answers, indices = result.get(timeout=timeout)
+        unmounted = {missing[i] for i in indices}
+        for event, value in zip(missing, answers):
+            if event in unmounted:
+                continue
+            values[event] = value
+            if mirror is not None:
+                mirror.record(sid, event.uuid, event.getter, value)
+
+    state = {
+        event.signal: getattr(COMPONENT_REGISTRY[event.uuid], f'_{event.getter}')(value)
+        for event, value in values.items()
+    }
+    # there's no state to post-process
+    state.update((event.signal, None) for event in unmounted)
+    return state
+
+
 def is_getter(attribute: str) -> bool:
     """Test if a method is a getter.
 
@@ -338,6 +749,18 @@ class Component(metaclass=_Maker):  # pylint: disable=too-few-public-methods
         mapping = FormatDict(component=tag)
         return formatter.vformat(wrap, (), mapping)
 
+    def _handlers(self) -> Dict[str, Callable]:
+        """Socket.io messages, other than events, this component responds to.
+
+        Maps the message name to a handler, the return value of the handler
+        is sent back to the client.
+        """
+        # pylint: disable=no-self-use
+        return {}
+
+    def _disconnect(self, sid: str) -> None:
+        """Drop any state held for a client that disconnected."""
+
     def __eq__(self, other) -> bool:
         """Compare Events for equality."""
         # pylint: disable=protected-access
@@ -0,0 +1,78 @@
+"""Run functions in thread or process pools."""
+
+from typing import Any, Callable, Dict, List, Tuple, Union  # pylint: disable=unused-import
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import update_wrapper
+
+from eventlet import tpool
+from greenlet import GreenletExit
+import flask
+
+from bowtie._component import datetime_format, recording, send
+
+_EXECUTORS = {}  # type: Dict[str, Executor]
+
+
+def get_executor(executor: Union[str, Executor]) -> Executor:
+    """Get the shared pool for 'thread' or 'process', or use the given executor."""
+    if isinstance(executor, Executor):
+        return executor
+    if executor not in _EXECUTORS:
+        if executor == 'thread':
+            _EXECUTORS[executor] = ThreadPoolExecutor()
+        elif executor == 'process':
+            _EXECUTORS[executor] = ProcessPoolExecutor()
+        else:
+            raise ValueError(
+                f'Executor must be "thread", "process" or an Executor, found {executor}.'
+            )
+    return _EXECUTORS[executor]
+
+
+def _capture(func: Callable, args: Tuple, fmt: str) -> List[Tuple[int, str, bytes, bool]]:
+    """Call the function and return the commands it sent.
+
+    The pool has no app context so commands are packed with the app's datetime format ``fmt``.
+    """
+    with datetime_format(fmt), recording(capture=True) as commands:
+        func(*args)
+    return commands
+
+
+class Offloaded:
+    """Function that runs in an executor.
+
+    Commands the function sends are collected and sent by the event loop
+    to the client that triggered it once the function returns.
+    The function can't use getters or the cache since it runs outside the event loop,
+    with a process pool the function and its arguments must be picklable.
+    """
+
+    def __init__(self, func: Callable, executor: Union[str, Executor]) -> None:
+        """Wrap a function.
+
+        Parameters
+        ----------
+        func : callable
+            Function to run in the executor.
+        executor : str or Executor
+            "thread", "process" or an executor.
+
+        """
+        update_wrapper(self, func)
+        self.func = func
+        self.executor = get_executor(executor)
+
+    def __call__(self, *args) -> None:
+        """Run the function in the executor without blocking the event loop."""
+        fmt = flask.current_app.extensions.get('bowtie.datetime_format', 'iso')
+        future = self.executor.submit(_capture, self.func, args, fmt)
+        try:
+            # wait in a real thread so other green threads keep running
+            commands = tpool.execute(future.result)
+        except GreenletExit:
+            # superseded, don't start it if it's still queued and drop its commands
+            future.cancel()
+            raise
+        for command in commands:
+            send(*command)
@@ -0,0 +1,98 @@
+"""Cache the commands a callback sends."""
+
+from typing import Any, Callable, List, Optional, Tuple  # pylint: disable=unused-import
+from collections import OrderedDict, namedtuple
+from collections.abc import Mapping
+from functools import update_wrapper
+import time
+
+from bowtie._component import pack, recording, send
+
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+def _canonical(obj: Any) -> Any:
+    """Tag values with their type and sort mappings so equal arguments pack the same.
+
+    Msgpack alone would tell dicts apart by insertion order
+    and pack tuples and lists, or str and bytes, the same.
+    """
+    if isinstance(obj, Mapping):
+        items = [[_canonical(key), _canonical(value)] for key, value in obj.items()]
+        return ['dict', sorted(items, key=lambda item: pack(item[0]))]
+    if isinstance(obj, (list, tuple)):
+        return [type(obj).__name__, [_canonical(x) for x in obj]]
+    cls = type(obj)
+    tag = '{}.{}'.format(cls.__module__, cls.__qualname__)
+    # e.g. numpy arrays of different integer types can pack the same
+    dtype = getattr(obj, 'dtype', None)
+    if dtype is not None:
+        tag += '[{}]'.format(dtype)
+    return [tag, obj]
+
+
+class Memoized:
+    """Callback that replays the commands it sent the last time it got the same arguments.
+
+    Arguments are compared by their serialized value and type, so lists and dicts
+    from component getters can be used as keys. Dicts with the same items
+    are the same key whatever their order.
+    Only commands and the return value are cached, other side effects are not repeated.
+    """
+
+    def __init__(self, func: Callable, maxsize: Optional[int] = 128, ttl: Optional[float] = None):
+        """Wrap a callback.
+
+        Parameters
+        ----------
+        func : callable
+            Callback to memoize.
+        maxsize : int, optional
+            Number of argument combinations to keep, the least recently used are dropped.
+            None keeps all of them.
+        ttl : float, optional
+            Seconds until a cached result expires, by default they never expire.
+
+        """
+        update_wrapper(self, func)
+        self.func = func
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        # (expires, commands, return value) keyed by packed arguments
+        self._results = OrderedDict()  # type: OrderedDict
+
+    def __call__(self, *args):
+        """Replay the cached commands or call the function and cache them."""
+        key = pack(_canonical(args))
+        result = self._results.get(key)
+        if result is not None:
+            expires, commands, retval = result
+            if expires is None or expires > time.monotonic():
+                self.hits += 1
+                self._results.move_to_end(key)
+                for command in commands:
+                    send(*command)
+                return retval
+            del self._results[key]
+
+        self.misses += 1
+        with recording() as commands:
+            retval = self.func(*args)
+        expires = None if self.ttl is None else time.monotonic() + self.ttl
+        self._results[key] = expires, commands, retval
+        if self.maxsize is not None and len(self._results) > self.maxsize:
+            self._results.popitem(last=False)
+        return retval
+
+    def cache_info(self) -> CacheInfo:
+        """Report the hits, misses and size of the cache."""
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._results))
+
+    def cache_clear(self) -> None:
+        """Clear the cache and the statistics."""
+        self._results.clear()
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,57 @@
+"""Keep a copy of the state each client reported on the server."""
+
+from typing import Any, Dict, Optional, Set, Tuple  # pylint: disable=unused-import
+
+
+class StateMirror:
+    """Last value each client reported for each component getter.
+
+    Values are stored before the getter post-processes them,
+    keyed by the client's session id and the component's uuid and getter name.
+    Commands sent to a component forget its values since they may change its state.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty mirror."""
+        self._values = {}  # type: Dict[Optional[str], Dict[Tuple[int, str], Any]]
+        self._ignored = set()  # type: Set[Tuple[int, str]]
+
+    def ignore(self, uuid: int, getter: str) -> None:
+        """Never remember the values of a component getter, e.g. one the browser holds back."""
+        self._ignored.add((uuid, getter))
+
+    def record(self, sid: Optional[str], uuid: int, getter: str, data: Any) -> None:
+        """Remember the value a client reported."""
+        if (uuid, getter) not in self._ignored:
+            self._values.setdefault(sid, {})[uuid, getter] = data
+
+    def get(self, sid: Optional[str], uuid: int, getter: str) -> Any:
+        """Return the last reported value.
+
+        Raises
+        ------
+        KeyError
+            If the client hasn't reported a value yet.
+
+        """
+        return self._values[sid][uuid, getter]
+
+    def invalidate(self, sid: Optional[str], uuid: int) -> None:
+        """Forget the values of a component.
+
+        Parameters
+        ----------
+        sid : str, optional
+            Session id of the client, if None forget it for every client.
+        uuid : int
+            Component's uuid.
+
+        """
+        sessions = self._values.values() if sid is None else [self._values.get(sid, {})]
+        for values in sessions:
+            for key in [key for key in values if key[0] == uuid]:
+                del values[key]
+
+    def disconnect(self, sid: str) -> None:
+        """Forget a client that disconnected."""
+        self._values.pop(sid, None)
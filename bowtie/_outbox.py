@@ -0,0 +1,166 @@
+"""Send commands to clients, optionally coalesced and rate limited."""
+
+from typing import Any, Dict, Generator, List, Optional, Tuple  # pylint: disable=unused-import
+from collections import OrderedDict
+from contextlib import contextmanager
+import itertools
+import time
+
+import eventlet
+import eventlet.corolocal
+from greenlet import GreenletExit
+import msgpack
+
+from bowtie._component import session_id
+
+BATCH = 'batch'
+
+
+class Outbox:
+    """Queue of commands waiting to be sent to each client.
+
+    Without a frame rate commands are sent as soon as they're issued.
+    With a frame rate each client receives at most that many frames per second.
+    Commands issued in between are held back, only the latest value
+    of a command that replaces state is kept, commands that depend
+    on the previous state are all kept in order. Pending commands are
+    sent together as a single batch frame.
+
+    Commands can also be explicitly batched with ``batch``.
+
+    With views commands only go to the clients displaying the component.
+    """
+
+    def __init__(self, socketio, max_frame_rate: Optional[float] = None, views=None) -> None:
+        """Create an outbox.
+
+        Parameters
+        ----------
+        socketio : flask_socketio.SocketIO
+        max_frame_rate : float, optional
+            Maximum number of frames per second sent to each client.
+        views : ViewTracker, optional
+            Views displayed by each client.
+
+        """
+        self.socketio = socketio
+        self.views = views
+        self.interval = 1 / max_frame_rate if max_frame_rate else 0
+        # commands are keyed by their signal when they can be coalesced
+        self._pending = {}  # type: Dict[Optional[str], OrderedDict]
+        self._sent = {}  # type: Dict[Optional[str], float]
+        self._timers = {}  # type: Dict[Optional[str], Any]
+        self._ordered = itertools.count()
+        # batches are collected separately for each green thread
+        self._local = eventlet.corolocal.local()
+
+    def _add(self, pending: OrderedDict, signal: str, data: bytes, coalesce: bool) -> None:
+        if coalesce:
+            # move it to the end so it's applied after everything issued before it
+            pending.pop(signal, None)
+            pending[signal] = signal, data
+        else:
+            pending[next(self._ordered)] = signal, data
+
+    def send(self, signal: str, data: bytes, coalesce: bool = True) -> None:
+        """Send a packed command to the current client or all clients.
+
+        Parameters
+        ----------
+        signal : str
+            Socket.io message name.
+        data : bytes
+            Packed command data.
+        coalesce : bool, optional
+            Whether a later command with the same signal makes this one redundant.
+
+        """
+        batch = getattr(self._local, 'batch', None)
+        if batch is not None:
+            self._add(batch, signal, data, coalesce)
+            return
+
+        if not self.interval:
+            self._emit(session_id(), OrderedDict([(signal if coalesce else 0, (signal, data))]))
+            return
+
+        sid = session_id()
+        self._add(self._pending.setdefault(sid, OrderedDict()), signal, data, coalesce)
+        self._schedule(sid)
+
+    @contextmanager
+    def batch(self) -> Generator[None, None, None]:
+        """Collect commands issued in this block and send them in one message.
+
+        Nested batches are part of the outermost batch.
+        The batch is dropped if the green thread is killed,
+        e.g. a call superseded by a newer event, since its commands are stale.
+        """
+        if getattr(self._local, 'batch', None) is not None:
+            yield
+            return
+        self._local.batch = OrderedDict()
+        try:
+            yield
+        except GreenletExit:
+            self._local.batch = None
+            raise
+        finally:
+            batch, self._local.batch = self._local.batch, None
+            if batch is not None:
+                self._send_batch(batch)
+
+    def _send_batch(self, batch: OrderedDict) -> None:
+        sid = session_id()
+        if not self.interval:
+            self._emit(sid, batch)
+        elif batch:
+            pending = self._pending.setdefault(sid, OrderedDict())
+            for key, (signal, data) in batch.items():
+                self._add(pending, signal, data, isinstance(key, str))
+            self._schedule(sid)
+
+    def _schedule(self, sid: Optional[str]) -> None:
+        """Flush now if enough time has passed since the last frame, otherwise later."""
+        if sid not in self._timers:
+            wait = self._sent.get(sid, 0) + self.interval - time.monotonic()
+            if wait <= 0:
+                self.flush(sid)
+            else:
+                self._timers[sid] = eventlet.spawn_after(wait, self.flush, sid)
+
+    def flush(self, sid: Optional[str]) -> None:
+        """Send all pending commands for a client in one frame."""
+        self._timers.pop(sid, None)
+        pending = self._pending.pop(sid, None)
+        if pending:
+            self._sent[sid] = time.monotonic()
+            self._emit(sid, pending)
+
+    def _emit(self, sid: Optional[str], pending: OrderedDict) -> None:
+        if self.views is None:
+            # room None broadcasts to all clients
+            self.send_frame(sid, list(pending.values()))
+            return
+        frame = [(isinstance(key, str), signal, data) for key, (signal, data) in pending.items()]
+        for room, commands in self.views.route(sid, frame):
+            self.send_frame(room, commands)
+
+    def send_frame(self, room: Optional[str], frame: List[Tuple[str, bytes]]) -> None:
+        """Send commands to a room in one frame right away."""
+        if not frame:
+            return
+        if len(frame) == 1:
+            signal, data = frame[0]
+        else:
+            # commands are already packed, keep them as binary
+            signal, data = BATCH, msgpack.packb(frame, use_bin_type=True)
+        self.socketio.emit(signal, {'data': data}, room=room)
+
+    def disconnect(self, sid: str) -> None:
+        """Forget a client that disconnected."""
+        timer = self._timers.pop(sid, None)
+        if timer is not None:
+            timer.cancel()
+        self._pending.pop(sid, None)
+        self._sent.pop(sid, None)
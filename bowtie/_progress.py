@@ -3,7 +3,7 @@
 Not for direct use by user.
 """
 
-from bowtie._component import Component
+from bowtie._component import Component, ordered
 
 
 class Progress(Component):
@@ -74,6 +74,7 @@ class Progress(Component):
         """
         return percent
 
+    @ordered
     def do_inc(self, inc):
         """Increment the progress indicator.
 
@@ -0,0 +1,130 @@
+"""Share socket.io messages between server processes on one machine."""
+
+from typing import Any, Dict  # pylint: disable=unused-import
+import os
+import struct
+import uuid
+
+import eventlet
+from eventlet.green import socket
+from eventlet.queue import Queue
+from eventlet.semaphore import Semaphore
+import msgpack
+import socketio
+
+from bowtie._broadcast import broadcast
+
+LOCAL = 'local://'
+
+_LENGTH = struct.Struct('!I')
+
+
+class LocalManager(socketio.PubSubManager):
+    """Publish messages over unix sockets in a directory.
+
+    Every server listens on its own socket in the directory
+    and sends each message to all the sockets in it, itself included.
+    Messages are encoded with msgpack, so they only hold plain data.
+    With ``encode_once`` messages for several clients are encoded once by each server.
+    It doesn't need a message queue service, which makes it handy for testing
+    and for running several workers on one machine.
+
+    Use it with ``App(message_queue='local:///path/to/directory')``.
+    """
+
+    name = 'local'
+
+    def __init__(
+        self, url: str, channel: str = 'bowtie', write_only: bool = False, encode_once: bool = False
+    ) -> None:
+        """Create a manager.
+
+        Parameters
+        ----------
+        url : str
+            ``local://`` followed by the directory for the sockets.
+        channel : str, optional
+            Name of the channel, servers on different channels don't share messages.
+        write_only : bool, optional
+            Only publish messages.
+        encode_once : bool, optional
+            Encode messages for several clients once, see ``bowtie._broadcast``.
+
+        """
+        super().__init__(channel=channel, write_only=write_only)
+        start = len(LOCAL)
+        self.directory = os.path.join(url[start:], channel)
+        os.makedirs(self.directory, exist_ok=True)
+        self.encode_once = encode_once
+        self._peers = {}  # type: Dict[str, Any]
+        # green threads must take turns writing to a peer
+        self._locks = {}  # type: Dict[str, Semaphore]
+        self._queue = Queue()
+
+    def initialize(self) -> None:
+        """Listen on this server's socket."""
+        if not self.write_only:
+            self._bind()
+        super().initialize()
+
+    def _bind(self) -> None:
+        # forked workers must not share the id, it routes callbacks
+        self.host_id = uuid.uuid4().hex
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(os.path.join(self.directory, self.host_id))
+        listener.listen()
+        eventlet.spawn(self._accept, listener)
+
+    def _accept(self, listener) -> None:
+        while True:
+            conn, _ = listener.accept()
+            eventlet.spawn(self._read, conn)
+
+    def _read(self, conn) -> None:
+        reader = conn.makefile('rb')
+        while True:
+            header = reader.read(_LENGTH.size)
+            if len(header) < _LENGTH.size:
+                return
+            (length,) = _LENGTH.unpack(header)
+            self._queue.put(msgpack.unpackb(reader.read(length), raw=False))
+
+    def _publish(self, data) -> None:
+        message = msgpack.packb(data, use_bin_type=True)
+        frame = _LENGTH.pack(len(message)) + message
+        for name in os.listdir(self.directory):
+            with self._locks.setdefault(name, Semaphore()):
+                self._send(name, frame)
+
+    def _send(self, name: str, frame: bytes) -> None:
+        peer = self._peers.get(name)
+        try:
+            if peer is None:
+                peer = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                peer.connect(os.path.join(self.directory, name))
+                self._peers[name] = peer
+            peer.sendall(frame)
+        except OSError:
+            # the server stopped, clean up its socket
+            self._peers.pop(name, None)
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+
+    def _handle_emit(self, message) -> None:
+        if not self.encode_once or message.get('callback') is not None:
+            super()._handle_emit(message)
+            return
+        broadcast(
+            self.server,
+            message['event'],
+            message['data'],
+            namespace=message.get('namespace'),
+            room=message.get('room'),
+            skip_sid=message.get('skip_sid'),
+        )
+
+    def _listen(self):
+        while True:
+            yield self._queue.get()
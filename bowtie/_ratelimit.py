@@ -0,0 +1,145 @@
+"""Limit how each client runs event handlers."""
+
+from typing import Any, Callable, Dict, Optional, Tuple  # pylint: disable=unused-import
+import math
+import time
+
+import eventlet
+
+
+class RateLimit:
+    """Limit how often each client runs a function.
+
+    With ``debounce`` events that arrive less than that many seconds after the last run
+    are merged, the function runs once the client stops sending them for that long.
+    With ``throttle`` it runs at most once every that many seconds,
+    the latest call is run at the end of the interval.
+    In both cases an event is run right away if the last run was long enough ago,
+    the browser already held it back so well behaved clients don't wait twice.
+    """
+
+    def __init__(self, debounce: Optional[float] = None, throttle: Optional[float] = None):
+        """Create a rate limit.
+
+        Parameters
+        ----------
+        debounce : float, optional
+            Seconds without events before running the function.
+        throttle : float, optional
+            Minimum seconds between runs of the function.
+
+        """
+        if debounce is not None and throttle is not None:
+            raise ValueError('Use either debounce or throttle, not both.')
+        if debounce is not None:
+            self._interval = debounce
+        elif throttle is not None:
+            self._interval = throttle
+        else:
+            raise ValueError('Use either debounce or throttle.')
+        self.debounce = debounce
+        self.throttle = throttle
+        self._timers = {}  # type: Dict[Optional[str], Any]
+        self._pending = {}  # type: Dict[Optional[str], Callable]
+        self._last = {}  # type: Dict[Optional[str], float]
+
+    def to_json(self) -> Dict[str, float]:
+        """Milliseconds for the browser to limit the event before it's sent."""
+        if self.debounce is not None:
+            return {'debounce': self.debounce * 1000}
+        return {'throttle': self._interval * 1000}
+
+    def __call__(self, sid: Optional[str], func: Callable) -> None:
+        """Run the function in a green thread when the limit allows it."""
+        self._pending[sid] = func
+        timer = self._timers.get(sid)
+        wait = self._last.get(sid, -math.inf) + self._interval - time.monotonic()
+        if self.debounce is not None:
+            if timer is None and wait <= 0:
+                self._run(sid)
+                return
+            # events came too fast, wait for them to stop
+            if timer is not None:
+                timer.cancel()
+            self._timers[sid] = eventlet.spawn_after(self.debounce, self._run, sid)
+            return
+
+        if timer is None:
+            if wait <= 0:
+                self._run(sid)
+            else:
+                self._timers[sid] = eventlet.spawn_after(wait, self._run, sid)
+
+    def _run(self, sid: Optional[str]) -> None:
+        self._timers.pop(sid, None)
+        func = self._pending.pop(sid, None)
+        if func is not None:
+            self._last[sid] = time.monotonic()
+            eventlet.spawn(func)
+
+    def disconnect(self, sid: str) -> None:
+        """Forget a client that disconnected."""
+        timer = self._timers.pop(sid, None)
+        if timer is not None:
+            timer.cancel()
+        self._pending.pop(sid, None)
+        self._last.pop(sid, None)
+
+
+class LatestWins:
+    """Only let the latest call of a function run for each client.
+
+    A ticket is issued when the event arrives so events are ordered
+    even if fetching their data takes longer for some of them.
+    Running a call kills the previous call that is still running,
+    and calls older than the latest ticket never start.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty registry of running calls."""
+        self._tickets = {}  # type: Dict[Tuple[Optional[str], Callable], int]
+        self._threads = {}  # type: Dict[Tuple[Optional[str], Callable], Any]
+
+    def ticket(self, sid: Optional[str], func: Callable) -> int:
+        """Issue a ticket for a new call."""
+        key = sid, func
+        self._tickets[key] = self._tickets.get(key, 0) + 1
+        return self._tickets[key]
+
+    def run(self, sid: Optional[str], func: Callable, ticket: int, call: Callable) -> None:
+        """Run the call in a green thread if it's still the latest.
+
+        Parameters
+        ----------
+        sid : str, optional
+            Session id of the client.
+        func : callable
+            The subscribed function.
+        ticket : int
+            Ticket issued for the call.
+        call : callable
+            Calls ``func`` with its arguments.
+
+        """
+        key = sid, func
+        if ticket != self._tickets.get(key):
+            return
+        old = self._threads.pop(key, None)
+        if old is not None:
+            # its output would be stale
+            old.kill()
+        thread = eventlet.spawn(call)
+        self._threads[key] = thread
+        thread.link(self._done, key)
+
+    def _done(self, thread, key: Tuple[Optional[str], Callable]) -> None:
+        if self._threads.get(key) is thread:
+            del self._threads[key]
+
+    def disconnect(self, sid: str) -> None:
+        """Kill the client's calls and forget it."""
+        for key in [key for key in self._tickets if key[0] == sid]:
+            del self._tickets[key]
+            thread = self._threads.pop(key, None)
+            if thread is not None:
+                thread.kill()
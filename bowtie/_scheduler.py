@@ -0,0 +1,347 @@
+"""Run functions periodically."""
+
+from typing import Callable, Dict, List, Optional, Set, cast  # pylint: disable=unused-import
+from bisect import bisect_left
+from collections import deque
+from datetime import datetime, timedelta
+import math
+import time
+import traceback
+
+import eventlet
+from eventlet.event import Event
+
+MODES = 'rate', 'delay'
+OVERLAPS = 'skip', 'queue', 'concurrent'
+
+# seconds, roughly 1-2.5-5 steps from a millisecond to a minute
+BOUNDS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    math.inf,
+)
+
+
+class Histogram:
+    """Count durations in buckets.
+
+    Each bucket counts the values up to its bound that are above the previous bound.
+    """
+
+    def __init__(self, bounds=BOUNDS) -> None:
+        """Create an empty histogram.
+
+        Parameters
+        ----------
+        bounds : sequence of float, optional
+            Increasing upper bounds of the buckets in seconds, the last one should be infinite.
+
+        """
+        self.bounds = tuple(bounds)
+        self.counts = [0] * len(self.bounds)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value: float) -> None:
+        """Count a value."""
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket that contains the quantile."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank and count:
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self) -> Dict:
+        """Summarize the histogram."""
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            'p50': self.quantile(0.5),
+            'p99': self.quantile(0.99),
+            'max': self.max,
+            'buckets': dict(zip(self.bounds, self.counts)),
+        }
+
+
+def _field(text: str, low: int, high: int) -> Set[int]:
+    values = set()  # type: Set[int]
+    for part in text.split(','):
+        part, _, step = part.partition('/')
+        if part == '*':
+            start, stop = low, high
+        elif '-' in part:
+            start, stop = map(int, part.split('-'))
+        else:
+            start = stop = int(part)
+            if step:
+                stop = high
+        if not low <= start <= stop <= high:
+            raise ValueError(f'Cron field "{text}" must be between {low} and {high}.')
+        values.update(range(start, stop + 1, int(step) if step else 1))
+    return values
+
+
+class Cron:
+    """Times matching a cron expression.
+
+    The expression has five fields: minute, hour, day of month, month and day of week,
+    with Sunday as 0 or 7. Fields are ``*``, numbers, ranges like ``1-5``,
+    lists like ``1,15`` and steps like ``*/10``. When both days are restricted
+    a time matching either of them matches, like cron.
+    """
+
+    def __init__(self, expression: str) -> None:
+        """Parse a cron expression."""
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f'Cron expression "{expression}" must have five fields.')
+        self.expression = expression
+        self.minutes = _field(fields[0], 0, 59)
+        self.hours = _field(fields[1], 0, 23)
+        self.days = _field(fields[2], 1, 31)
+        self.months = _field(fields[3], 1, 12)
+        # datetime weekdays start on Monday
+        self.weekdays = {(day - 1) % 7 for day in _field(fields[4], 0, 7)}
+        self._any_day = fields[2] == '*'
+        self._any_weekday = fields[4] == '*'
+
+    def _day_matches(self, when: datetime) -> bool:
+        day = when.day in self.days
+        weekday = when.weekday() in self.weekdays
+        if self._any_day or self._any_weekday:
+            return day and weekday
+        return day or weekday
+
+    def next(self, after: datetime) -> datetime:
+        """First matching time after the given time."""
+        when = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = when + timedelta(days=366 * 5)
+        while when < limit:
+            if when.month not in self.months:
+                year, month = divmod(when.month, 12)
+                when = when.replace(year=when.year + year, month=month + 1, day=1, hour=0, minute=0)
+            elif not self._day_matches(when):
+                when = when.replace(hour=0, minute=0) + timedelta(days=1)
+            elif when.hour not in self.hours:
+                when = when.replace(minute=0) + timedelta(hours=1)
+            elif when.minute not in self.minutes:
+                when += timedelta(minutes=1)
+            else:
+                return when
+        raise ValueError(f'Cron expression "{self.expression}" never matches.')
+
+
+class Scheduler:
+    """Run a function periodically.
+
+    At a fixed rate the function is due every ``seconds`` measured from the start,
+    so the period doesn't drift with the function's run time. When a run is due
+    while the previous one is still going, the ``overlap`` policy decides
+    whether it's skipped, queued to run right after it, or run concurrently.
+    At most one run is queued, runs due while one is already queued are skipped.
+    With a fixed delay the next run is due ``seconds`` after the previous one finished.
+    A cron expression makes runs due at the matching wall clock times.
+
+    Lateness (start minus due time), run time and latency (end minus due time)
+    of every run are recorded in histograms, see ``stats``.
+
+    A paused scheduler doesn't start new runs. Once resumed an interval starts over
+    with a run right away, a cron schedule waits for the next matching time.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        app,
+        seconds: Optional[float],
+        func: Callable,
+        per_session: bool = False,
+        mode: str = 'rate',
+        overlap: str = 'skip',
+        cron: Optional[str] = None,
+        name: Optional[str] = None,
+        pause_idle: bool = False,
+    ) -> None:
+        """Create a scheduled function.
+
+        Parameters
+        ----------
+        app : flask.Flask
+            Provides the app context to the function.
+        seconds : float, optional
+            Interval between runs, required without ``cron``.
+        func : callable
+            Function to run.
+        per_session : bool, optional
+            Whether the function is run for each client.
+        mode : str, optional
+            "rate" or "delay".
+        overlap : str, optional
+            "skip", "queue" or "concurrent".
+        cron : str, optional
+            Cron expression instead of an interval.
+        name : str, optional
+            Name in the stats, the function's name by default.
+        pause_idle : bool, optional
+            Whether the app pauses it when no clients are connected.
+
+        """
+        if (seconds is None) == (cron is None):
+            raise ValueError('Schedule a function with either seconds or cron.')
+        if mode not in MODES:
+            raise ValueError(f'Mode must be one of {MODES}, found {mode}.')
+        if overlap not in OVERLAPS:
+            raise ValueError(f'Overlap must be one of {OVERLAPS}, found {overlap}.')
+        self.app = app
+        self.seconds = seconds
+        self.func = func
+        self.per_session = per_session
+        self.mode = mode
+        self.overlap = overlap
+        self.cron = None if cron is None else Cron(cron)
+        self.name = name or getattr(func, '__name__', repr(func))
+        self.pause_idle = pause_idle
+        self.thread = None
+        self._resumed = None  # type: Optional[Event]
+        self._running = set()  # type: Set
+        self._queued = deque()  # type: deque
+        self.skipped = 0
+        self.missed = 0
+        self.lateness = Histogram()
+        self.runtime = Histogram()
+        self.latency = Histogram()
+
+    def start(self) -> None:
+        """Start the scheduled task."""
+        self.thread = eventlet.spawn(self.run)
+
+    def _wait(self, due: float) -> None:
+        wait = due - time.monotonic()
+        if wait > 0:
+            eventlet.sleep(wait)
+
+    def _next_cron(self) -> float:
+        """Monotonic time of the next cron match."""
+        now = datetime.now()
+        return time.monotonic() + (self.cron.next(now) - now).total_seconds()  # type: ignore
+
+    def run(self) -> None:
+        """Invoke the function repeatedly on a timer."""
+        due = self._next_cron() if self.cron else time.monotonic()
+        # seconds is set whenever there's no cron expression
+        interval = cast(float, self.seconds)
+        while True:
+            self._wait(due)
+            if self._resumed is not None:
+                self._resumed.wait()
+                due = time.monotonic()
+                if self.cron:
+                    due = self._next_cron()
+                    continue
+            if self.mode == 'delay':
+                self._call(due)
+                due = self._next_cron() if self.cron else time.monotonic() + interval
+                continue
+
+            self._trigger(due)
+            if self.cron:
+                due = self._next_cron()
+                continue
+            due += interval
+            now = time.monotonic()
+            if due < now:
+                # the event loop was blocked, keep to the original grid
+                missed = math.ceil((now - due) / interval)
+                self.missed += missed
+                due += missed * interval
+
+    @property
+    def paused(self) -> bool:
+        """Whether new runs are held back."""
+        return self._resumed is not None
+
+    def pause(self) -> None:
+        """Hold back new runs, a run that already started finishes."""
+        if self._resumed is None:
+            self._resumed = Event()
+
+    def resume(self) -> None:
+        """Start runs again."""
+        resumed, self._resumed = self._resumed, None
+        if resumed is not None:
+            resumed.send()
+
+    def _trigger(self, due: float) -> None:
+        """Start a run at a fixed rate following the overlap policy."""
+        if self._running and (self.overlap == 'skip' or self.overlap == 'queue' and self._queued):
+            # a queued run already catches up, more would pile up without bound
+            self.skipped += 1
+        elif self._running and self.overlap == 'queue':
+            self._queued.append(due)
+        else:
+            thread = eventlet.spawn(self._work, due)
+            self._running.add(thread)
+            thread.link(self._running.discard)
+
+    def _work(self, due: float) -> None:
+        self._call(due)
+        while self._queued:
+            self._call(self._queued.popleft())
+
+    def _call(self, due: float) -> None:
+        start = time.monotonic()
+        self.lateness.add(max(start - due, 0))
+        try:
+            with self.app.app_context():
+                self.func()
+        except Exception:  # pylint: disable=broad-except
+            traceback.print_exc()
+        end = time.monotonic()
+        self.runtime.add(end - start)
+        self.latency.add(max(end - due, 0))
+
+    def stats(self) -> Dict:
+        """Runs, skipped and missed runs, and summaries of the histograms."""
+        return {
+            'name': self.name,
+            'runs': self.runtime.count,
+            'paused': self.paused,
+            'running': len(self._running),
+            'queued': len(self._queued),
+            'skipped': self.skipped,
+            'missed': self.missed,
+            'lateness': self.lateness.to_dict(),
+            'runtime': self.runtime.to_dict(),
+            'latency': self.latency.to_dict(),
+        }
+
+    def stop(self) -> None:
+        """Stop the scheduled task and its runs."""
+        if self.thread:
+            self.thread.kill()
+        self._queued.clear()
+        for thread in list(self._running):
+            thread.kill()
@@ -0,0 +1,199 @@
+"""Track the connected clients and run the workers serving them."""
+
+from typing import Callable, List, Optional, Set  # pylint: disable=unused-import
+import os
+import signal
+import socket
+import sys
+import traceback
+import uuid
+
+from flask import Flask, request
+from flask_socketio import SocketIO, join_room, leave_room
+
+from bowtie._component import session
+from bowtie._outbox import Outbox
+from bowtie._scheduler import Scheduler
+from bowtie._views import VIEW, ViewTracker, room
+
+
+class Server:
+    """Clients connected to this worker and the worker processes.
+
+    Scheduled functions that pause without clients are paused
+    when the last client disconnects and resumed when one connects.
+    Each worker tracks its own clients and runs its own scheduled functions.
+    """
+
+    def __init__(
+        self, socketio: SocketIO, outbox: Outbox, views: ViewTracker, message_queue: Optional[str]
+    ) -> None:
+        """Create a server without clients.
+
+        Parameters
+        ----------
+        socketio : SocketIO
+            Socket.io extension of the app.
+        outbox : Outbox
+            Sends the commands to the clients.
+        views : ViewTracker
+            Tracks the view each client displays.
+        message_queue : str, optional
+            URL of the message queue shared by the workers.
+
+        """
+        self.socketio = socketio
+        self.outbox = outbox
+        self.views = views
+        self.message_queue = message_queue
+        self.schedules = []  # type: List[Scheduler]
+        self.sessions = set()  # type: Set[str]
+        self._prepared = False
+
+    def each_session(self, func: Callable) -> Callable:
+        """Call the function for each connected client in turn."""
+
+        def each():
+            for sid in list(self.sessions):
+                # it may have disconnected in the meantime
+                if sid in self.sessions:
+                    with session(sid):
+                        try:
+                            func()
+                        except Exception:  # pylint: disable=broad-except
+                            traceback.print_exc()
+
+        return each
+
+    def connect(self, forget: Callable[[str], None]) -> None:
+        """Track the clients and their views.
+
+        Parameters
+        ----------
+        forget : callable
+            Called with the session id of a client that disconnected
+            to forget what the app keeps for it.
+
+        """
+        # registering a handler replaces the one before, e.g. authentication
+        authorize = self.socketio.server.handlers.get('/', {}).get('connect')
+
+        @self.socketio.on('connect')
+        def connect():  # pylint: disable=unused-variable
+            if authorize is not None and authorize(request.sid, request.environ) is False:
+                return False
+            self.sessions.add(request.sid)
+            # until the client reports its view its components aren't listening
+            join_room(room(None))
+            self.pause_idle()
+            return None
+
+        @self.socketio.on(VIEW)
+        def view(view_id):  # pylint: disable=unused-variable
+            # the id comes from the client
+            try:
+                view_id = int(view_id)
+            except (TypeError, ValueError):
+                return
+            if view_id not in self.views:
+                return
+            sid = request.sid
+            leave_room(room(self.views.view(sid)))
+            join_room(room(view_id))
+            self.outbox.send_frame(sid, self.views.open(sid, view_id))
+
+        @self.socketio.on('disconnect')
+        def disconnect():  # pylint: disable=unused-variable
+            self.sessions.discard(request.sid)
+            self.pause_idle()
+            self.outbox.disconnect(request.sid)
+            self.views.disconnect(request.sid)
+            forget(request.sid)
+
+    def start(self) -> None:
+        """Start the scheduled functions in this worker."""
+        for schedule in self.schedules:
+            schedule.start()
+        self.pause_idle()
+
+    def prepare(self, endpoints: Callable[[], None]) -> None:
+        """Register the endpoints and start the scheduled functions once."""
+        if not self._prepared:
+            self._prepared = True
+            endpoints()
+            self.start()
+
+    def pause_idle(self) -> None:
+        """Pause scheduled functions without clients and resume them with clients."""
+        for schedule in self.schedules:
+            if schedule.pause_idle:
+                if self.sessions:
+                    schedule.resume()
+                else:
+                    schedule.pause()
+
+    def serve(
+        self,
+        app: Flask,
+        endpoints: Callable[[], None],
+        host: str = '0.0.0.0',
+        port: int = 9991,
+        workers: int = 1,
+    ) -> None:
+        """Serve the app from one or several worker processes.
+
+        Parameters
+        ----------
+        app : Flask
+            The app to serve.
+        endpoints : callable
+            Registers the endpoints, called once before forking the workers.
+        host : str, optional
+            Host interface to listen on.
+        port : int, optional
+            Port every worker listens on.
+        workers : int, optional
+            Number of worker processes, several workers need a message queue.
+
+        """
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        result = sock.connect_ex((host, port))
+        if result == 0:
+            raise Exception(f'Port {port} is unavailable on host {host}, aborting.')
+        if workers > 1 and self.message_queue is None:
+            raise ValueError('Several workers need a message queue to share messages.')
+
+        # workers inherit the endpoints but start their own green threads after the fork,
+        # a worker may never get a plain http request to start them lazily
+        self._prepared = True
+        endpoints()
+
+        # every worker listens on the same port with SO_REUSEPORT
+        children = []
+        for _ in range(1, workers):
+            pid = os.fork()
+            if pid == 0:
+                # only the first worker runs scheduled functions,
+                # except for those called for each of the worker's clients
+                self.schedules = [schedule for schedule in self.schedules if schedule.per_session]
+                manager = self.socketio.server.manager
+                if hasattr(manager, 'host_id'):
+                    # message queues route callbacks to workers by this id
+                    manager.host_id = uuid.uuid4().hex
+                self.start()
+                self.socketio.run(app, host=host, port=port)
+                os._exit(0)  # pylint: disable=protected-access
+            children.append(pid)
+        if children:
+            # stop the other workers too when asked to stop
+            signal.signal(signal.SIGTERM, lambda *args: sys.exit(0))
+
+        self.start()
+        try:
+            self.socketio.run(app, host=host, port=port)
+        finally:
+            for schedule in self.schedules:
+                schedule.stop()
+            for pid in children:
+                os.kill(pid, signal.SIGTERM)
+                os.waitpid(pid, 0)
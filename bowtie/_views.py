@@ -0,0 +1,141 @@
+"""Deliver commands to the clients displaying the component."""
+
+from typing import Dict, List, Optional, Set, Tuple  # pylint: disable=unused-import
+from collections import OrderedDict
+import itertools
+
+from bowtie._component import SEPARATOR
+
+VIEW = 'view'
+
+
+def room(view: Optional[int]) -> str:
+    """Socket.io room of the clients displaying a view.
+
+    Clients that haven't reported their view yet are in the room of ``None``
+    and only receive commands for components that aren't on any view.
+    """
+    return f'{VIEW}{SEPARATOR}{"" if view is None else view}'
+
+
+class ViewTracker:
+    """Track the view each client displays.
+
+    Commands for components that aren't on the client's view are never seen,
+    the component isn't mounted. Commands that replace the component's state
+    are deferred instead, only the latest one for each signal,
+    and sent when the client opens a view showing the component.
+    Commands that depend on the previous state are dropped.
+    Components that aren't on any view, e.g. pagers, always get their commands.
+    Until a client reports its view, i.e. its components are listening,
+    commands for every component on a view are deferred or dropped the same way.
+
+    Commands are numbered so a deferred broadcast is only sent to a client
+    if it's newer than the commands the client got for that signal.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty registry."""
+        self._component_views = {}  # type: Dict[int, Set[int]]
+        self._views = set()  # type: Set[int]
+        self._sessions = {}  # type: Dict[str, int]
+        self._sequence = itertools.count()
+        # deferred broadcasts are keyed by None, values are (number, data)
+        self._deferred = {}  # type: Dict[Optional[str], OrderedDict]
+        # number of the latest command each client got or deferred for each signal
+        self._latest = {}  # type: Dict[str, Dict[str, int]]
+
+    def __contains__(self, view: int) -> bool:
+        """Whether the view was registered."""
+        return view in self._views
+
+    def add(self, view: int, components: List[int]) -> None:
+        """Register the components shown by a view."""
+        self._views.add(view)
+        for component in components:
+            self._component_views.setdefault(component, set()).add(view)
+
+    def view(self, sid: str) -> Optional[int]:
+        """View displayed by a client, None until it reports one."""
+        return self._sessions.get(sid)
+
+    def _shows(self, view: Optional[int], signal: str) -> bool:
+        uuid, _, _ = signal.partition(SEPARATOR)
+        views = self._component_views.get(int(uuid)) if uuid.isdigit() else None
+        return views is None or view in views
+
+    def route(
+        self, sid: Optional[str], frame: List[Tuple[bool, str, bytes]]
+    ) -> List[Tuple[str, List[Tuple[str, bytes]]]]:
+        """Split a frame of commands into the frames for each room.
+
+        Parameters
+        ----------
+        sid : str, optional
+            Session id of the client, None broadcasts to every client.
+        frame : list of tuples
+            Whether the command can be coalesced, its signal and data.
+
+        Returns
+        -------
+        list of tuples
+            Rooms and the commands they receive.
+
+        """
+        numbered = [(next(self._sequence), *command) for command in frame]
+        if sid is not None:
+            view = self.view(sid)
+            latest = self._latest.setdefault(sid, {})
+            visible = []
+            for number, coalesce, signal, data in numbered:
+                latest[signal] = number
+                if self._shows(view, signal):
+                    visible.append((signal, data))
+                elif coalesce:
+                    self._defer(sid, number, signal, data)
+            return [(sid, visible)]
+
+        frames = []
+        for view in [None, *sorted(self._views)]:
+            visible = []
+            for number, coalesce, signal, data in numbered:
+                if self._shows(view, signal):
+                    visible.append((signal, data))
+                elif coalesce:
+                    self._defer(None, number, signal, data)
+            frames.append((room(view), visible))
+        return frames
+
+    def _defer(self, sid: Optional[str], number: int, signal: str, data: bytes) -> None:
+        deferred = self._deferred.setdefault(sid, OrderedDict())
+        deferred.pop(signal, None)
+        deferred[signal] = number, data
+
+    def open(self, sid: str, view: int) -> List[Tuple[str, bytes]]:
+        """Record the view a client displays and return the commands deferred for it.
+
+        Commands are returned in the order they were issued.
+        """
+        self._sessions[sid] = view
+        latest = self._latest.setdefault(sid, {})
+        own = self._deferred.get(sid, OrderedDict())
+        commands = {}
+        for signal in [signal for signal in own if self._shows(view, signal)]:
+            commands[signal] = own.pop(signal)
+        # broadcasts stay deferred for other clients
+        for signal, (number, data) in self._deferred.get(None, {}).items():
+            if number > latest.get(signal, -1) and self._shows(view, signal):
+                if signal not in commands or number > commands[signal][0]:
+                    commands[signal] = number, data
+        for signal, (number, _) in commands.items():
+            latest[signal] = number
+        return [
+            (signal, data)
+            for signal, (_, data) in sorted(commands.items(), key=lambda item: item[1][0])
+        ]
+
+    def disconnect(self, sid: str) -> None:
+        """Forget a client that disconnected."""
+        self._sessions.pop(sid, None)
+        self._deferred.pop(sid, None)
+        self._latest.pop(sid, None)
@@ -2,7 +2,7 @@
 
 from typing import Callable, Dict, Optional, Union, Sequence, List
 
-from bowtie._component import Component, jdumps, jsbool, jsnull
+from bowtie._component import Component, jdumps, jsbool, jsnull, ordered
 
 
 # pylint: disable=too-few-public-methods
@@ -636,6 +636,7 @@ class Slider(_Controller):
         """
         return value
 
+    @ordered
     def do_inc(self, value=1):
         """Increment value of slider by given amount.
 
@@ -5,11 +5,9 @@ Reference
 https://ant.design/components/message/
 """
 
-import flask
-from flask_socketio import emit
 import eventlet
 
-from bowtie._component import pack
+from bowtie._component import client_emit, pack
 from bowtie._utils import func_name
 
 
@@ -24,11 +22,7 @@ def _message(status, content):
 
     """
     event = f'message.{status}'
-    if flask.has_request_context():
-        emit(event, dict(data=pack(content)))
-    else:
-        sio = flask.current_app.extensions['socketio']
-        sio.emit(event, dict(data=pack(content)))
+    client_emit(event, dict(data=pack(content)))
     eventlet.sleep()
 
 
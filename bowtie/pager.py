@@ -1,10 +1,8 @@
 """Bowtie pager."""
 
-import flask
-from flask_socketio import emit
 import eventlet
 
-from bowtie._component import SEPARATOR
+from bowtie._component import SEPARATOR, client_emit
 
 _NAME = 'page' + SEPARATOR
 
@@ -28,9 +26,5 @@ class Pager:
 
         The function passed to ``App.respond`` will get called.
         """
-        if flask.has_request_context():
-            emit(_NAME + str(self._uuid))
-        else:
-            sio = flask.current_app.extensions['socketio']
-            sio.emit(_NAME + str(self._uuid))
+        client_emit(_NAME + str(self._uuid))
         eventlet.sleep()
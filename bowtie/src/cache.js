@@ -0,0 +1,134 @@
+// Storage for bowtie.cache
+//
+// Values are msgpack bytes. Small values are stored base64 encoded in sessionStorage,
+// large values go to IndexedDB since sessionStorage only holds a few MB.
+
+// values larger than this many bytes are stored in IndexedDB
+const LARGE = 1 << 18;
+const PREFIX = 'cache64:';
+const EXPIRES = 'cacheexp:';
+const TAB = 'bowtie-tab';
+const DATABASE = 'bowtie';
+const STORE = 'cache';
+
+const toBase64 = bytes => {
+    var chunks = [];
+    // fromCharCode takes one argument per byte, so convert in chunks
+    for (var i = 0; i < bytes.length; i += 0x8000) {
+        chunks.push(String.fromCharCode.apply(null, bytes.subarray(i, i + 0x8000)));
+    }
+    return btoa(chunks.join(''));
+};
+
+const fromBase64 = str => {
+    var binary = atob(str);
+    var bytes = new Uint8Array(binary.length);
+    for (var i = 0; i < binary.length; i++) {
+        bytes[i] = binary.charCodeAt(i);
+    }
+    return bytes;
+};
+
+// IndexedDB is shared by all tabs, prefix keys with an id
+// kept in sessionStorage so each tab has its own cache like sessionStorage
+const tabId = () => {
+    var id = sessionStorage.getItem(TAB);
+    if (id === null) {
+        id = Math.random().toString(36).slice(2);
+        sessionStorage.setItem(TAB, id);
+    }
+    return id;
+};
+
+var database = null;
+
+const openDatabase = () => {
+    if (database === null) {
+        database = new Promise((resolve, reject) => {
+            var request = indexedDB.open(DATABASE, 1);
+            request.onupgradeneeded = () => request.result.createObjectStore(STORE);
+            request.onsuccess = () => resolve(request.result);
+            request.onerror = () => reject(request.error);
+        });
+    }
+    return database;
+};
+
+const transact = (mode, action) => {
+    return openDatabase().then(db => {
+        return new Promise((resolve, reject) => {
+            var tx = db.transaction(STORE, mode);
+            var request = action(tx.objectStore(STORE));
+            tx.oncomplete = () => resolve(request.result);
+            tx.onerror = () => reject(tx.error);
+        });
+    });
+};
+
+const expired = key => {
+    var expires = sessionStorage.getItem(EXPIRES + key);
+    return expires !== null && parseFloat(expires) <= Date.now();
+};
+
+export const deleteBytes = key => {
+    var name = PREFIX + key;
+    var stored = sessionStorage.getItem(name);
+    sessionStorage.removeItem(name);
+    sessionStorage.removeItem(EXPIRES + key);
+    if (stored === '') {
+        return transact('readwrite', store => store.delete(tabId() + key));
+    }
+    return Promise.resolve();
+};
+
+// ttl is in seconds, null if it never expires
+export const saveBytes = (key, bytes, ttl) => {
+    var name = PREFIX + key;
+    var stored = sessionStorage.getItem(name);
+    if (ttl === null || ttl === undefined) {
+        sessionStorage.removeItem(EXPIRES + key);
+    } else {
+        sessionStorage.setItem(EXPIRES + key, Date.now() + ttl * 1000);
+    }
+    if (bytes.length > LARGE && window.indexedDB) {
+        // an empty string marks values stored in IndexedDB, msgpack is never empty
+        sessionStorage.setItem(name, '');
+        return transact('readwrite', store => store.put(bytes, tabId() + key));
+    }
+    sessionStorage.setItem(name, toBase64(bytes));
+    if (stored === '') {
+        return transact('readwrite', store => store.delete(tabId() + key));
+    }
+    return Promise.resolve();
+};
+
+// resolves to null if the key doesn't exist or expired
+export const loadBytes = key => {
+    if (expired(key)) {
+        return deleteBytes(key).then(() => null);
+    }
+    var stored = sessionStorage.getItem(PREFIX + key);
+    if (stored === null) {
+        return Promise.resolve(null);
+    }
+    if (stored === '') {
+        return transact('readonly', store => store.get(tabId() + key)).then(bytes => {
+            return bytes === undefined ? null : bytes;
+        });
+    }
+    return Promise.resolve(fromBase64(stored));
+};
+
+export const cacheKeys = () => {
+    var keys = [];
+    for (var i = 0; i < sessionStorage.length; i++) {
+        var name = sessionStorage.key(i);
+        if (name.startsWith(PREFIX)) {
+            var key = name.slice(PREFIX.length);
+            if (!expired(key)) {
+                keys.push(key);
+            }
+        }
+    }
+    return keys;
+};
@@ -2,6 +2,7 @@ import PropTypes from 'prop-types';
 import React from 'react';
 import Plotly from 'plotly.js/dist/plotly.js';
 import cloneDeep from 'lodash.clonedeep';
+import { jsonReplacer } from './utils';
 
 var msgpack = require('msgpack-lite');
 
@@ -12,6 +13,7 @@ export default class PlotlyPlot extends React.Component {
         this.click = null;
         this.hover = null;
         this.layout = null;
+        this.dirty = false;
 
         var local = sessionStorage.getItem(this.props.uuid);
         if (local === null) {
@@ -23,9 +25,14 @@ export default class PlotlyPlot extends React.Component {
         this.resize = this.resize.bind(this);
         this.props.socket.on(this.props.uuid + '#all', data => {
             var arr = new Uint8Array(data['data']);
-            this.setState(msgpack.decode(arr));
-            sessionStorage.setItem(this.props.uuid, JSON.stringify(msgpack.decode(arr)));
+            var plot = msgpack.decode(arr);
+            this.setState(plot);
+            sessionStorage.setItem(this.props.uuid, JSON.stringify(plot, jsonReplacer));
+            this.dirty = false;
         });
+        this.props.socket.on(this.props.uuid + '#extend', this.extend);
+        this.props.socket.on(this.props.uuid + '#restyle', this.restyle);
+        this.props.socket.on(this.props.uuid + '#relayout', this.relayout);
         this.props.socket.on(this.props.uuid + '#get', this.getSelection);
         this.props.socket.on(this.props.uuid + '#get_select', this.getSelection);
         this.props.socket.on(this.props.uuid + '#get_click', this.getClick);
@@ -33,6 +40,44 @@ export default class PlotlyPlot extends React.Component {
         this.props.socket.on(this.props.uuid + '#get_layout', this.getLayout);
     }
 
+    // incremental updates modify the plot in place, the plot is saved
+    // for page refreshes when leaving instead of on every update
+    extend = data => {
+        var arr = new Uint8Array(data['data']);
+        var args = msgpack.decode(arr);
+        if (args[2] === null) {
+            Plotly.extendTraces(this.container, args[0], args[1]);
+        } else {
+            Plotly.extendTraces(this.container, args[0], args[1], args[2]);
+        }
+        this.dirty = true;
+    };
+
+    restyle = data => {
+        var arr = new Uint8Array(data['data']);
+        var args = msgpack.decode(arr);
+        if (args[1] === null) {
+            Plotly.restyle(this.container, args[0]);
+        } else {
+            Plotly.restyle(this.container, args[0], args[1]);
+        }
+        this.dirty = true;
+    };
+
+    relayout = data => {
+        var arr = new Uint8Array(data['data']);
+        Plotly.relayout(this.container, msgpack.decode(arr));
+        this.dirty = true;
+    };
+
+    save = () => {
+        if (this.dirty) {
+            var plot = { data: this.container.data, layout: this.container.layout };
+            sessionStorage.setItem(this.props.uuid, JSON.stringify(plot, jsonReplacer));
+            this.dirty = false;
+        }
+    };
+
     setSelection = data => {
         data.points = data.points.map(this.processPoint);
         this.selection = data;
@@ -129,6 +174,7 @@ export default class PlotlyPlot extends React.Component {
         }); //, config);
 
         this.addListeners();
+        window.addEventListener('beforeunload', this.save);
         // this.setState({layout: layout});
     }
 
@@ -155,7 +201,12 @@ export default class PlotlyPlot extends React.Component {
     }
 
     componentWillUnmount() {
+        this.save();
+        window.removeEventListener('beforeunload', this.save);
         this.props.socket.off(this.props.uuid + '#all');
+        this.props.socket.off(this.props.uuid + '#extend');
+        this.props.socket.off(this.props.uuid + '#restyle');
+        this.props.socket.off(this.props.uuid + '#relayout');
         this.props.socket.off(this.props.uuid + '#get');
         this.props.socket.off(this.props.uuid + '#get_select');
         this.props.socket.off(this.props.uuid + '#get_click');
@@ -0,0 +1,6 @@
+// load chunks from the bundle's directory so the app also works behind a path prefix,
+// this module is imported first so it runs before any chunk is requested
+if (document.currentScript) {
+    // eslint-disable-next-line no-undef, camelcase
+    __webpack_public_path__ = document.currentScript.src.split('?')[0].replace(/[^/]*$/, '');
+}
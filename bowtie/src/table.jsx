@@ -9,11 +9,14 @@ var msgpack = require('msgpack-lite');
 export default class AntTable extends React.Component {
     constructor(props) {
         super(props);
-        var local = sessionStorage.getItem(this.props.uuid);
+        // server side tables keep their data on the server
+        var local = this.props.serverSide ? null : sessionStorage.getItem(this.props.uuid);
         if (local === null) {
             this.state = {
-                data: [],
+                data: {},
                 columns: this.props.columns,
+                page: 1,
+                total: 0,
             };
         } else {
             this.state = JSON.parse(local);
@@ -25,13 +28,77 @@ export default class AntTable extends React.Component {
         var socket = this.props.socket;
         socket.on(uuid + '#data', this.newData);
         socket.on(uuid + '#columns', this.newColumns);
+        if (this.props.serverSide) {
+            this.fetchPage(1, {}, {});
+        }
     }
 
     newData = (data, fn) => {
         var arr = new Uint8Array(data['data']);
         var datacols = msgpack.decode(arr);
-        this.setState({ data: datacols[0], columns: datacols[1] });
-        storeState(this.props.uuid, this.state, { data: datacols[0], columns: datacols[1] });
+        if (this.props.serverSide) {
+            this.setState({
+                data: datacols[0],
+                columns: datacols[1],
+                total: datacols[2],
+                page: 1,
+                filters: {},
+                sorter: {},
+            });
+        } else {
+            this.setState({ data: datacols[0], columns: datacols[1], page: 1 });
+            storeState(this.props.uuid, this.state, {
+                data: datacols[0],
+                columns: datacols[1],
+                page: 1,
+            });
+        }
+    };
+
+    fetchPage = (page, filters, sorter) => {
+        var query = {
+            page: page,
+            filters: filters,
+            sortField: sorter.field || null,
+            sortOrder: sorter.order || null,
+        };
+        this.props.socket.emit(this.props.uuid + '#page', msgpack.encode(query), data => {
+            var arr = new Uint8Array(data);
+            var result = msgpack.decode(arr);
+            this.setState({
+                data: result[0],
+                total: result[1],
+                page: page,
+                filters: filters,
+                sorter: sorter,
+            });
+        });
+    };
+
+    onChange = (pagination, filters, sorter) => {
+        if (this.props.serverSide) {
+            this.fetchPage(pagination.current, filters, sorter);
+        } else {
+            this.setState({ page: pagination.current });
+        }
+    };
+
+    // data is stored by column, only build the rows for the current page
+    pageData = () => {
+        var data = this.state.data;
+        var keys = data.key || [];
+        var start = this.props.serverSide ? 0 : (this.state.page - 1) * this.props.resultsPerPage;
+        var end = Math.min(start + this.props.resultsPerPage, keys.length);
+        var names = Object.keys(data);
+        var rows = [];
+        for (var i = start; i < end; i++) {
+            var row = {};
+            for (var j = 0; j < names.length; j++) {
+                row[names[j]] = data[names[j]][i];
+            }
+            rows.push(row);
+        }
+        return rows;
     };
 
     newColumns = (data, fn) => {
@@ -42,14 +109,20 @@ export default class AntTable extends React.Component {
     };
 
     render() {
+        var total = this.props.serverSide ? this.state.total : (this.state.data.key || []).length;
         return (
             <ConfigProvider locale={enUS}>
                 <Table
-                    dataSource={this.state.data}
+                    dataSource={this.pageData()}
                     columns={this.state.columns}
                     size="small"
                     bordered={true}
-                    pagination={{ pageSize: this.props.resultsPerPage }}
+                    pagination={{
+                        current: this.state.page,
+                        pageSize: this.props.resultsPerPage,
+                        total: total,
+                    }}
+                    onChange={this.onChange}
                     style={{ width: '100%' }}
                     scroll={{ y: false }}
                 />
@@ -63,4 +136,5 @@ AntTable.propTypes = {
     socket: PropTypes.object.isRequired,
     columns: PropTypes.array.isRequired,
     resultsPerPage: PropTypes.number.isRequired,
+    serverSide: PropTypes.bool.isRequired,
 };
@@ -1,5 +1,13 @@
+// numpy arrays arrive as typed arrays which JSON.stringify turns into objects
+export const jsonReplacer = (key, value) => {
+    if (ArrayBuffer.isView(value)) {
+        return Array.from(value);
+    }
+    return value;
+};
+
 export const storeState = (uuid, state, data) => {
-    sessionStorage.setItem(uuid, JSON.stringify(Object.assign(state, data)));
+    sessionStorage.setItem(uuid, JSON.stringify(Object.assign(state, data), jsonReplacer));
 };
 
 export const str2ints = x => {
@@ -2,7 +2,7 @@ import 'normalize.css';
 import React from 'react';
 import PropTypes from 'prop-types';
 
-import { components } from './components';
+import { components, socket } from './components';
 import { str2ints } from './utils';
 
 export class View extends React.Component {
@@ -16,18 +16,41 @@ export class View extends React.Component {
             spans: this.props.spans,
             controllers: this.props.controllers,
             sidebar: this.props.sidebar,
+            components: {},
         };
     }
 
+    componentDidMount() {
+        this.mounted = true;
+        // only load the modules of the components on this view
+        const uuids = [].concat(this.state.controllers, ...Object.values(this.state.spans));
+        Promise.all(uuids.map(uuid => components[uuid]())).then(elements => {
+            if (!this.mounted) {
+                return;
+            }
+            const loaded = {};
+            uuids.forEach((uuid, i) => {
+                loaded[uuid] = elements[i];
+            });
+            // the server only sends commands for the components on this view,
+            // report it once they are mounted and listening
+            this.setState({ components: loaded }, () => socket.emit('view', this.props.uuid));
+        });
+    }
+
+    componentWillUnmount() {
+        this.mounted = false;
+    }
+
     render() {
         var widgets = [];
         const controls = this.state.controllers.map(index => (
-            <div key={index.toString()}>{components[index]}</div>
+            <div key={index.toString()}>{this.state.components[index]}</div>
         ));
         for (const key in this.state.spans) {
             if (Object.prototype.hasOwnProperty.call(this.state.spans, key)) {
                 const comps = this.state.spans[key].map(number => (
-                    <div key={number.toString}>{components[number]}</div>
+                    <div key={number.toString}>{this.state.components[number]}</div>
                 ));
                 const rowcols = str2ints(key);
                 widgets.push(
@@ -1,15 +1,27 @@
 const merge = require('webpack-merge');
+const zlib = require('zlib');
 const common = require('./webpack.common.js');
 var CompressionPlugin = require('compression-webpack-plugin');
 
-var config = {
-    mode: 'production',
-    plugins: [
+var plugins = [
+    new CompressionPlugin({
+        filename: '[path].gz[query]',
+        algorithm: 'gzip',
+    }),
+];
+// brotli is only built into node 11.7 and later, older versions serve gzip alone
+if (zlib.brotliCompress) {
+    plugins.push(
         new CompressionPlugin({
-            filename: '[path].gz[query]',
-            algorithm: 'gzip',
+            filename: '[path].br[query]',
+            algorithm: 'brotliCompress',
         }),
-    ],
+    );
+}
+
+var config = {
+    mode: 'production',
+    plugins: plugins,
 };
 
 module.exports = merge(common, config);
@@ -0,0 +1,26 @@
+"""Test authentication."""
+# pylint: disable=protected-access
+
+from base64 import b64encode
+
+from bowtie import App
+from bowtie.auth import BasicAuth
+
+
+def test_socketio_auth():
+    """Test the app's connect handler keeps refusing unauthenticated clients."""
+    app = App()
+    BasicAuth(app, {'alice': 'secret'})
+    app._prepare()
+
+    client = app._socketio.test_client(app.app)
+    assert not client.is_connected()
+    assert app.sessions == []
+
+    flask_client = app.app.test_client()
+    credentials = b64encode(b'alice:secret').decode()
+    flask_client.get('/', headers={'Authorization': f'Basic {credentials}'})
+    client = app._socketio.test_client(app.app, flask_test_client=flask_client)
+    assert client.is_connected()
+    assert len(app.sessions) == 1
+    client.disconnect()
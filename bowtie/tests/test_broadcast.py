@@ -0,0 +1,60 @@
+"""Test encoding broadcast messages once."""
+# pylint: disable=protected-access
+
+from inspect import signature
+
+from engineio.socket import Socket
+import socketio
+from socketio import packet
+
+from bowtie import App
+from bowtie._broadcast import BroadcastManager
+
+
+def test_broadcast():
+    """Test every client gets the same encoded packets."""
+    sio = socketio.Server(async_mode='eventlet', client_manager=BroadcastManager(), binary=True)
+    sio.manager.initialize()
+    sockets = []
+    for sid in ['a', 'b', 'c']:
+        sock = Socket(sio.eio, sid)
+        sio.eio.sockets[sid] = sock
+        sio.manager.connect(sid, '/')
+        sockets.append(sock)
+
+    sio.emit('1#value', {'data': b'\x01\x02'}, skip_sid='c')
+    received = [[sock.queue.get() for _ in range(sock.queue.qsize())] for sock in sockets]
+    assert received[2] == []
+    first, second, _ = received
+    assert [pkt.encode() for pkt in first] == [pkt.encode() for pkt in second]
+    assert first[0].encode() is second[0].encode()
+
+    decoded = packet.Packet(encoded_packet=first[0].data)
+    decoded.add_attachment(first[1].data)
+    assert decoded.data == ['1#value', {'data': b'\x01\x02'}]
+
+    sio.emit('1#value', {'data': b'\x03'}, room='b')
+    assert [sock.queue.qsize() for sock in sockets] == [0, 2, 0]
+
+
+def test_internals():
+    """Test the socket.io internals broadcasting relies on still exist."""
+    sio = socketio.Server(async_mode='eventlet', binary=True)
+    sio.manager.initialize()
+    sio.eio.sockets['a'] = Socket(sio.eio, 'a')
+    sio.manager.connect('a', '/')
+    assert 'a' in sio.manager.rooms['/'][None]
+    assert list(signature(sio._emit_internal).parameters)[:4] == [
+        'sid',
+        'event',
+        'data',
+        'namespace',
+    ]
+    assert list(signature(sio.eio._get_socket('a').send).parameters) == ['pkt']
+
+
+def test_opt_in(tmpdir):
+    """Test apps use socket.io's manager unless they opt in."""
+    assert type(App()._socketio.server.manager) is socketio.BaseManager
+    assert isinstance(App(encode_once=True)._socketio.server.manager, BroadcastManager)
+    assert not App(message_queue='local://' + str(tmpdir))._socketio.server.manager.encode_once
@@ -0,0 +1,102 @@
+"""Test the javascript bundle and its chunks."""
+# pylint: disable=protected-access
+
+import gzip
+import os
+
+from bowtie import App, View
+from bowtie.control import Slider
+from bowtie.visual import Plotly
+from bowtie._assets import Assets
+
+
+def test_lazy_modules(tmp_path):
+    """Test component modules are imported on demand."""
+    app = App(rows=2)
+    app.add(Slider())
+    view = View()
+    view.add(Plotly())
+    app.add_route(view, 'plot')
+    app._build_dir = tmp_path
+    app._write_templates()
+
+    components = (tmp_path / 'bowtiejs' / 'components.js').read_text()
+    assert "import(/* webpackChunkName: \"plotly\" */ './plotly')" in components
+    assert "import PlotlyPlot" not in components
+    assert "modules['slider']().then(" in components
+
+    # chunks load from wherever the bundle was loaded
+    index = (tmp_path / 'bowtiejs' / 'index.jsx').read_text()
+    assert index.startswith("import './publicpath';")
+    assert (tmp_path / 'bowtiejs' / 'publicpath.js').is_file()
+
+
+def test_chunk(tmp_path):
+    """Test chunks are served compressed and cached for good."""
+    app = App()
+    app._chunks = Assets(tmp_path / 'chunks')
+    chunks = tmp_path / 'chunks'
+    chunks.mkdir()
+    (chunks / 'plotly.abc.js').write_text('plotly')
+    (chunks / 'plotly.abc.js.gz').write_bytes(gzip.compress(b'plotly'))
+
+    client = app.app.test_client()
+    # routes are added by the first request
+    client.get('/bowtie/chunks/plotly.abc.js')
+    response = client.get('/bowtie/chunks/plotly.abc.js')
+    assert response.data == b'plotly'
+    assert 'immutable' in response.headers['Cache-Control']
+
+    response = client.get('/bowtie/chunks/plotly.abc.js', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(response.data) == b'plotly'
+    response.close()
+
+    assert client.get('/bowtie/chunks/missing.js').status_code == 404
+
+
+def test_bundle(tmp_path):
+    """Test the bundle is served from memory with its ETag and encodings."""
+    app = App()
+    app._assets = Assets(tmp_path)
+    (tmp_path / 'bundle.js').write_text('bundle')
+    (tmp_path / 'bundle.js.br').write_bytes(b'brotli')
+
+    client = app.app.test_client()
+    page = client.get('/').data.decode()
+    version = app._assets.version('bundle.js')
+    assert f'bowtie/bundle.js?v={version}' in page
+
+    (tmp_path / 'bundle.js').write_text('changed')
+    response = client.get('/bowtie/bundle.js')
+    assert response.data == b'bundle'
+    assert response.headers['Cache-Control'] == 'no-cache'
+    assert 'Content-Encoding' not in response.headers
+    etag = response.headers['ETag']
+    assert client.get('/bowtie/bundle.js', headers={'If-None-Match': etag}).status_code == 304
+
+    response = client.get(f'/bowtie/bundle.js?v={version}', headers={'Accept-Encoding': 'gzip'})
+    assert 'immutable' in response.headers['Cache-Control']
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(response.data) == b'bundle'
+
+    response = client.get('/bowtie/bundle.js', headers={'Accept-Encoding': 'gzip, br'})
+    assert response.headers['Content-Encoding'] == 'br'
+    assert response.data == b'brotli'
+    assert response.headers['ETag'] != etag
+
+    response = client.get('/bowtie/bundle.js', headers={'Accept-Encoding': 'br;q=0, gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+
+
+def test_reload(tmp_path):
+    """Test changed files are read again for development."""
+    assets = Assets(tmp_path, reload=True)
+    path = tmp_path / 'bundle.js'
+    path.write_text('first')
+    first = assets.version('bundle.js')
+    path.write_text('second')
+    os.utime(path, (0, 0))
+    assert assets.version('bundle.js') != first
+    path.unlink()
+    assert assets.version('bundle.js') == ''
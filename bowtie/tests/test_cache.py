@@ -3,8 +3,9 @@
 
 import time
 
+import eventlet
 import pytest
-from bowtie import App, cache
+from bowtie import App, DiskCache, MemoryCache, cache
 from bowtie.control import Button
 from bowtie.tests.utils import reset_uuid, server_check
 
@@ -23,6 +24,11 @@ def click():
     cache[b'b'] = True
     assert cache[b'b']
     assert cache[u'b']
+    cache.set_many({'c': [1, 2], 'd': 'x'})
+    assert cache.get_many(['c', 'd', 'e']) == {'c': [1, 2], 'd': 'x', 'e': None}
+    del cache['c']
+    assert 'c' not in cache
+    assert set(cache.keys()) == {'a', 'b', 'd'}
 
 
 def test_keys():
@@ -59,3 +65,79 @@ def test_cache(dummy, chrome_driver):
     btx = chrome_driver.find_element_by_class_name('ant-btn')
     btx.click()
     time.sleep(2)
+
+
+def test_memory():
+    """Test the least recently used values are dropped."""
+    backend = MemoryCache(max_bytes=10)
+    app = App(cache=backend)
+    with app.app.test_request_context():
+        cache['a'] = '1234'
+        cache['b'] = '1234'
+        assert cache['a'] == '1234'
+        cache['c'] = '1234'
+        assert cache['b'] is None
+        assert cache[b'a'] == '1234'
+        assert cache['c'] == '1234'
+        with pytest.warns(UserWarning):
+            cache['c'] = '12345678901'
+        # the oversized value doesn't evict anything else
+        assert cache['c'] is None
+        assert cache['a'] == '1234'
+    backend.disconnect(None)
+    with app.app.test_request_context():
+        assert cache['a'] is None
+
+
+def test_disk(tmpdir):
+    """Test values are stored in files."""
+    app = App(cache=DiskCache(str(tmpdir)))
+    with app.app.test_request_context():
+        cache['a'] = {'x': [1, 2]}
+        assert cache['a'] == {'x': [1, 2]}
+        assert cache['b'] is None
+    app2 = App(cache=DiskCache(str(tmpdir)))
+    with app2.app.test_request_context():
+        assert cache[b'a'] == {'x': [1, 2]}
+
+
+def test_disk_concurrent(tmpdir):
+    """Test green threads writing the same key don't share a temporary file."""
+    app = App(cache=DiskCache(str(tmpdir)))
+
+    def write(value):
+        with app.app.test_request_context():
+            cache['a'] = value
+
+    pool = eventlet.GreenPool()
+    for value in range(20):
+        pool.spawn(write, value)
+    pool.waitall()
+    with app.app.test_request_context():
+        assert cache['a'] in range(20)
+    assert [path.basename for path in tmpdir.join('_').listdir()] == [
+        DiskCache(str(tmpdir))._path(None, 'a').name  # pylint: disable=protected-access
+    ]
+
+
+@pytest.mark.parametrize('backend', ['memory', 'disk'])
+def test_bulk(backend, tmpdir, monkeypatch):
+    """Test loading, storing, deleting and expiring several keys."""
+    clock = [1000.0]
+    monkeypatch.setattr('time.monotonic', lambda: clock[0])
+    monkeypatch.setattr('time.time', lambda: clock[0])
+    app = App(cache=MemoryCache() if backend == 'memory' else DiskCache(str(tmpdir)))
+    with app.app.test_request_context():
+        cache.set_many({'a': 1, b'b': [2, 3]})
+        cache.set('c', 'x', ttl=10)
+        assert cache.get_many(['a', 'b', 'c', 'd']) == {'a': 1, 'b': [2, 3], 'c': 'x', 'd': None}
+        assert sorted(cache.keys()) == ['a', 'b', 'c']
+        assert 'c' in cache
+
+        clock[0] += 10
+        assert cache['c'] is None
+        assert sorted(cache.keys()) == ['a', 'b']
+
+        cache.delete('a', 'd')
+        del cache[b'b']
+        assert cache.keys() == []
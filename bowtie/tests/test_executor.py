@@ -0,0 +1,68 @@
+"""Test running callbacks in thread and process pools."""
+
+from datetime import datetime
+
+import eventlet
+import pytest
+
+from bowtie import App
+from bowtie.control import Slider
+from bowtie._component import pack, unpack
+
+slider = Slider()
+
+
+def double(value):
+    """Send twice the value back to the slider."""
+    slider.do_value(value * 2)
+
+
+@pytest.mark.parametrize('executor', ['thread', 'process'])
+def test_executor(executor):
+    """Test commands sent in the pool reach the client that sent the event."""
+    app = App()
+    app.add(slider)
+    app.subscribe(slider.on_change, executor=executor)(double)
+
+    app._endpoints()  # pylint: disable=protected-access
+    client = app._socketio.test_client(app.app)  # pylint: disable=protected-access
+    other = app._socketio.test_client(app.app)  # pylint: disable=protected-access
+    for each in [client, other]:
+        each.emit('view', str(app._root._uuid))  # pylint: disable=protected-access
+    client.emit(slider.on_change.signal, pack(3))
+    for _ in range(100):
+        received = client.get_received()
+        if received:
+            break
+        eventlet.sleep(0.05)
+    assert [(message['name'], unpack(message['args'][0]['data'])) for message in received] == [
+        ('{}#value'.format(slider._uuid), 6)  # pylint: disable=protected-access
+    ]
+    assert not other.get_received()
+    client.disconnect()
+    other.disconnect()
+
+
+def stamp(value):
+    """Send a datetime to the slider."""
+    slider.do_value(datetime(1970, 1, 1 + value))
+
+
+@pytest.mark.parametrize('executor', [None, 'thread', 'process'])
+def test_datetime_format(executor):
+    """Test the pool packs datetimes with the app's format."""
+    app = App(datetime_format='epoch')
+    app.add(slider)
+    app.subscribe(slider.on_change, executor=executor)(stamp)
+
+    app._endpoints()  # pylint: disable=protected-access
+    client = app._socketio.test_client(app.app)  # pylint: disable=protected-access
+    client.emit('view', str(app._root._uuid))  # pylint: disable=protected-access
+    client.emit(slider.on_change.signal, pack(1))
+    for _ in range(100):
+        received = client.get_received()
+        if received:
+            break
+        eventlet.sleep(0.05)
+    assert [unpack(message['args'][0]['data']) for message in received] == [86400000.0]
+    client.disconnect()
@@ -0,0 +1,62 @@
+"""Test memoizing callbacks."""
+
+from bowtie import App
+from bowtie.control import Slider
+from bowtie._component import unpack
+
+
+def test_memoize(monkeypatch):
+    """Test cached commands are sent again without calling the function."""
+    clock = [1000.0]
+    monkeypatch.setattr('time.monotonic', lambda: clock[0])
+    app = App()
+    slider = Slider()
+    sent = []
+    monkeypatch.setattr(app._outbox, 'send', lambda signal, data, coalesce: sent.append(data))
+    calls = []
+
+    @app.memoize(maxsize=2, ttl=10)
+    def callback(value):
+        calls.append(value)
+        slider.do_value(value['x'])
+        return value['x']
+
+    with app.app.test_request_context():
+        assert callback({'x': 1}) == 1
+        assert callback({'x': 1}) == 1
+        assert callback({'x': 2}) == 2
+        assert calls == [{'x': 1}, {'x': 2}]
+        assert [unpack(data) for data in sent] == [1, 1, 2]
+        assert callback.cache_info() == (1, 2, 2, 2)
+
+        # evicts the least recently used
+        callback({'x': 3})
+        callback({'x': 1})
+        assert calls[-1] == {'x': 1}
+
+        clock[0] += 10
+        callback({'x': 1})
+        assert callback.misses == 5
+        assert len(calls) == 5
+
+
+def test_key():
+    """Test equal arguments share a key and different types don't."""
+    app = App()
+    calls = []
+
+    @app.memoize(maxsize=None)
+    def callback(value):
+        calls.append(value)
+
+    with app.app.test_request_context():
+        callback({'x': 1, 'y': 2})
+        callback({'y': 2, 'x': 1})
+        assert len(calls) == 1
+        callback([1, 2])
+        callback((1, 2))
+        callback('a')
+        callback(b'a')
+        assert len(calls) == 5
+        callback({'y': 2, 'x': 1})
+        assert len(calls) == 5
@@ -0,0 +1,84 @@
+"""Test mirroring the state of components on the server."""
+
+import eventlet
+import pytest
+
+from bowtie import App
+from bowtie.control import Slider, Switch, Textbox
+from bowtie._component import get_many, pack, session
+from bowtie._mirror import StateMirror
+
+
+def test_invalidate():
+    """Test commands forget the state of a component."""
+    mirror = StateMirror()
+    mirror.record('a', 1, 'get', 3)
+    mirror.record('a', 2, 'get', 4)
+    mirror.record('b', 1, 'get', 5)
+    assert mirror.get('a', 1, 'get') == 3
+
+    mirror.invalidate('a', 1)
+    assert mirror.get('b', 1, 'get') == 5
+    assert mirror.get('a', 2, 'get') == 4
+    with pytest.raises(KeyError):
+        mirror.get('a', 1, 'get')
+
+    mirror.invalidate(None, 1)
+    assert mirror.get('a', 2, 'get') == 4
+    with pytest.raises(KeyError):
+        mirror.get('b', 1, 'get')
+
+
+def test_subscribe():
+    """Test callbacks use the mirrored state instead of asking the browser."""
+    app = App(rows=3, mirror_state=True)
+    slider = Slider()
+    switch = Switch()
+    text = Textbox()
+    app.add(slider)
+    app.add(switch)
+    app.add(text)
+    values = []
+
+    @app.subscribe(slider.on_change, switch.on_switch)
+    def callback(slide, swit):  # pylint: disable=unused-variable
+        values.append((slide, swit, text.get()))
+
+    app._endpoints()  # pylint: disable=protected-access
+    client = app._socketio.test_client(app.app)  # pylint: disable=protected-access
+    client.emit(switch.on_switch.signal, pack(True))
+    client.emit(text.on_change.signal, pack('hi'))
+    client.emit(slider.on_change.signal, pack(3))
+    eventlet.sleep(0.1)
+    # both events call the callback after all the values are recorded
+    assert values == [(3, True, 'hi')] * 2
+    assert not [message for message in client.get_received() if message['name'] == 'bulk_get']
+    client.disconnect()
+
+
+class Range(Slider):
+    """Slider reporting the ends of a range."""
+
+    def get(self, data):
+        """Get the width of the range."""
+        return data[1] - data[0]
+
+
+def test_unmounted(monkeypatch):
+    """Test components not mounted in the browser get None without post-processing."""
+    app = App(mirror_state=True)
+    mounted = Range()
+    unmounted = Range()
+
+    def answer(signal, data, callback):  # pylint: disable=unused-argument
+        callback(pack([[[2, 5], None], [1]]))
+
+    monkeypatch.setattr('bowtie._component.client_emit', answer)
+    mirror = app._mirror  # pylint: disable=protected-access
+    with app.app.app_context(), session('a'):
+        state = get_many([mounted.on_change, unmounted.on_change])
+    assert state == {mounted.on_change.signal: 3, unmounted.on_change.signal: None}
+    # only the mounted component's state is mirrored
+    assert mirror.get('a', mounted._uuid, 'get') == [2, 5]  # pylint: disable=protected-access
+    with pytest.raises(KeyError):
+        mirror.get('a', unmounted._uuid, 'get')  # pylint: disable=protected-access
@@ -0,0 +1,75 @@
+"""Test coalescing and rate limiting commands."""
+# pylint: disable=redefined-outer-name
+
+import eventlet
+import pytest
+
+from bowtie._component import unpack
+from bowtie._outbox import Outbox, BATCH
+
+
+class FakeSocketIO:
+    """Record emitted messages."""
+
+    def __init__(self):
+        """Create empty record."""
+        self.messages = []
+
+    def emit(self, signal, message, room=None):
+        """Record a message."""
+        self.messages.append((signal, message['data'], room))
+
+
+@pytest.fixture
+def socketio():
+    """Fake socketio server."""
+    return FakeSocketIO()
+
+
+def test_immediate(socketio):
+    """Test commands are sent right away without a frame rate."""
+    outbox = Outbox(socketio)
+    outbox.send('1#value', b'a')
+    outbox.send('1#value', b'b')
+    assert socketio.messages == [('1#value', b'a', None), ('1#value', b'b', None)]
+
+
+def test_coalesce(socketio):
+    """Test only the latest value is sent and ordered commands are batched."""
+    outbox = Outbox(socketio, max_frame_rate=20)
+    outbox.send('1#value', b'a')
+    for value in [b'b', b'c', b'd']:
+        outbox.send('1#value', value)
+        outbox.send('2#inc', value, coalesce=False)
+    assert socketio.messages == [('1#value', b'a', None)]
+
+    eventlet.sleep(0.1)
+    assert len(socketio.messages) == 2
+    signal, data, _ = socketio.messages[1]
+    assert signal == BATCH
+    assert unpack(data) == [
+        ['2#inc', b'b'],
+        ['2#inc', b'c'],
+        ['1#value', b'd'],
+        ['2#inc', b'd'],
+    ]
+
+
+def test_batch(socketio):
+    """Test commands in a batch are sent together in one message."""
+    outbox = Outbox(socketio)
+    with outbox.batch():
+        outbox.send('1#value', b'a')
+        with outbox.batch():
+            outbox.send('2#inc', b'b', coalesce=False)
+        outbox.send('1#value', b'c')
+        assert socketio.messages == []
+    assert len(socketio.messages) == 1
+    signal, data, room = socketio.messages[0]
+    assert signal == BATCH
+    assert room is None
+    assert unpack(data) == [['2#inc', b'b'], ['1#value', b'c']]
+
+    with outbox.batch():
+        outbox.send('1#value', b'd')
+    assert socketio.messages[1] == ('1#value', b'd', None)
@@ -0,0 +1,46 @@
+"""Test sharing messages between servers."""
+# pylint: disable=protected-access
+
+import eventlet
+
+from bowtie import App
+from bowtie._queue import LocalManager
+
+
+def test_local(tmpdir):
+    """Test a message published by one server reaches every server."""
+    url = 'local://' + str(tmpdir)
+    first = LocalManager(url)
+    second = LocalManager(url)
+    first._bind()
+    second._bind()
+
+    first._publish({'method': 'emit', 'event': '1#value', 'data': b'x'})
+    for manager in [first, second]:
+        with eventlet.Timeout(1):
+            assert next(manager._listen())['data'] == b'x'
+
+
+def test_concurrent(tmpdir):
+    """Test green threads publishing at once don't write to a peer simultaneously."""
+    url = 'local://' + str(tmpdir)
+    first = LocalManager(url)
+    second = LocalManager(url)
+    first._bind()
+    second._bind()
+
+    data = b'x' * 2 ** 20
+    pool = eventlet.GreenPool()
+    for _ in range(10):
+        pool.spawn(first._publish, {'method': 'emit', 'event': '1#value', 'data': data})
+    listen = second._listen()
+    with eventlet.Timeout(5):
+        for _ in range(10):
+            assert next(listen)['data'] == data
+    pool.waitall()
+
+
+def test_app(tmpdir):
+    """Test the app uses the local manager."""
+    app = App(message_queue='local://' + str(tmpdir))
+    assert isinstance(app._socketio.server.manager, LocalManager)
@@ -0,0 +1,149 @@
+"""Test debouncing and throttling events."""
+
+from functools import partial
+import time
+
+import eventlet
+import msgpack
+import pytest
+
+from bowtie import App
+from bowtie.control import Slider
+from bowtie._component import pack, unpack
+from bowtie._ratelimit import RateLimit
+
+
+@pytest.mark.parametrize(
+    'limit, expected', [({'debounce': 0.05}, [0, 4]), ({'throttle': 1}, [0, 4])]
+)
+def test_limit(limit, expected):
+    """Test a drag only runs the callback with the first and last value."""
+    app = App()
+    slider = Slider()
+    app.add(slider)
+    values = []
+
+    @app.subscribe(slider.on_change, **limit)
+    def callback(value):  # pylint: disable=unused-variable
+        values.append(value)
+
+    app._endpoints()  # pylint: disable=protected-access
+    client = app._socketio.test_client(app.app)  # pylint: disable=protected-access
+    for i in range(5):
+        client.emit(slider.on_change.signal, pack(i))
+        eventlet.sleep(0.01)
+    assert values == expected[:1]
+    eventlet.sleep(0.1 if 'debounce' in limit else 1.1)
+    assert values == expected
+    client.disconnect()
+
+
+def test_no_extra_latency():
+    """Test events the browser already debounced run right away."""
+    limit = RateLimit(debounce=0.05)
+    values = []
+    for i in range(3):
+        limit('a', partial(values.append, i))
+        eventlet.sleep(0.01)
+        assert values == list(range(i + 1))
+        eventlet.sleep(0.05)
+
+
+def test_conflict():
+    """Test an event can't be limited twice with different values."""
+    app = App()
+    slider = Slider()
+    app.subscribe(slider.on_change, debounce=0.1)(lambda x: None)
+    with pytest.raises(ValueError):
+        app.subscribe(slider.on_change, throttle=0.1)(lambda x: None)
+    with pytest.raises(ValueError):
+        app.subscribe(slider.on_after_change, throttle=0.1, debounce=0.1)
+    # a conflict doesn't limit the other events
+    with pytest.raises(ValueError):
+        app.subscribe(slider.on_after_change, slider.on_change, throttle=0.1)
+    assert list(app._limits) == [slider.on_change]  # pylint: disable=protected-access
+
+
+def test_shared():
+    """Test every function subscribed to a limited event is limited and getters ask the browser."""
+    app = App(mirror_state=True)
+    slider = Slider()
+    app.add(slider)
+    limited = []
+    unlimited = []
+    app.subscribe(slider.on_change, debounce=0.05)(limited.append)
+    app.subscribe(slider.on_change)(unlimited.append)
+
+    app._endpoints()  # pylint: disable=protected-access
+    client = app._socketio.test_client(app.app)  # pylint: disable=protected-access
+    for i in range(3):
+        client.emit(slider.on_change.signal, pack(i))
+        eventlet.sleep(0.01)
+    eventlet.sleep(0.1)
+    assert limited == unlimited == [0, 2]
+    assert not app._mirror._values  # pylint: disable=protected-access
+    client.disconnect()
+
+
+def test_latest_wins():
+    """Test a newer event kills the call that is still running."""
+    app = App()
+    slider = Slider()
+    app.add(slider)
+    started = []
+    finished = []
+
+    @app.subscribe(slider.on_change, latest_wins=True)
+    def callback(value):  # pylint: disable=unused-variable
+        started.append(value)
+        eventlet.sleep(0.05)
+        finished.append(value)
+
+    app._endpoints()  # pylint: disable=protected-access
+    client = app._socketio.test_client(app.app)  # pylint: disable=protected-access
+    for i in range(3):
+        client.emit(slider.on_change.signal, pack(i))
+        eventlet.sleep(0.01)
+    eventlet.sleep(0.1)
+    assert started == [0, 1, 2]
+    assert finished == [2]
+    client.disconnect()
+
+
+@pytest.mark.parametrize('executor', [None, 'thread'])
+def test_superseded(executor):
+    """Test a killed call doesn't send the commands it issued."""
+    app = App()
+    slider = Slider()
+    app.add(slider)
+
+    def work(value):
+        time.sleep(0.05)
+        slider.do_value(value)
+
+    @app.subscribe(slider.on_change, latest_wins=True, executor=executor)
+    def callback(value):  # pylint: disable=unused-variable
+        if executor is not None:
+            work(value)
+            return
+        with app.batch():
+            slider.do_max(value)
+            eventlet.sleep(0.05)
+            slider.do_value(value)
+
+    app._endpoints()  # pylint: disable=protected-access
+    client = app._socketio.test_client(app.app)  # pylint: disable=protected-access
+    client.emit('view', str(app._root._uuid))  # pylint: disable=protected-access
+    client.get_received()
+    for i in range(3):
+        client.emit(slider.on_change.signal, pack(i))
+        eventlet.sleep(0.01)
+    eventlet.sleep(0.2)
+    received = client.get_received()
+    assert len(received) == 1
+    data = received[0]['args'][0]['data']
+    if executor is None:
+        assert [unpack(value) for _, value in msgpack.unpackb(data, raw=False)] == [2, 2]
+    else:
+        assert unpack(data) == 2
+    client.disconnect()
@@ -0,0 +1,187 @@
+"""Test scheduled functions."""
+
+from datetime import datetime
+import time
+
+import eventlet
+from flask import Flask
+import pytest
+from werkzeug.test import Client
+
+from bowtie import App
+from bowtie._scheduler import Cron, Histogram, Scheduler
+
+
+def run(scheduler, seconds):
+    """Run the scheduler for a while."""
+    scheduler.start()
+    eventlet.sleep(seconds)
+    scheduler.stop()
+
+
+def test_rate():
+    """Test calls keep to the interval no matter how long they take."""
+    starts = []
+
+    def func():
+        starts.append(time.monotonic())
+        eventlet.sleep(0.01)
+
+    scheduler = Scheduler(Flask(__name__), 0.02, func)
+    run(scheduler, 0.21)
+    assert len(starts) == 11
+    for i, start in enumerate(starts):
+        assert abs(start - starts[0] - i * 0.02) < 0.01
+    assert scheduler.stats()['lateness']['count'] == 11
+
+
+@pytest.mark.parametrize(
+    'overlap, calls, concurrent',
+    [('skip', 3, 1), ('concurrent', 5, 2)],
+)
+def test_overlap(overlap, calls, concurrent):
+    """Test calls that are due while the last one is running."""
+    running = []
+    most = []
+
+    def func():
+        running.append(1)
+        most.append(len(running))
+        eventlet.sleep(0.03)
+        running.pop()
+
+    scheduler = Scheduler(Flask(__name__), 0.02, func, overlap=overlap)
+    scheduler.start()
+    eventlet.sleep(0.09)
+    scheduler.thread.kill()
+    eventlet.sleep(0.2)
+    assert len(most) == calls
+    assert max(most) == concurrent
+    if overlap == 'skip':
+        assert scheduler.skipped == 2
+
+
+def test_queue_one():
+    """Test only one call waits for a slow call, the others are skipped."""
+    calls = []
+    running = []
+
+    def func():
+        calls.append(len(running))
+        running.append(1)
+        eventlet.sleep(0.1)
+        running.pop()
+
+    scheduler = Scheduler(Flask(__name__), 0.02, func, overlap='queue')
+    scheduler.start()
+    eventlet.sleep(0.09)
+    scheduler.thread.kill()
+    assert scheduler.stats()['queued'] == 1
+    eventlet.sleep(0.25)
+    # the queued call runs after the first one
+    assert calls == [0, 0]
+    assert scheduler.skipped == 3
+
+
+def test_delay():
+    """Test the interval starts when the call returns."""
+    starts = []
+
+    def func():
+        starts.append(time.monotonic())
+        eventlet.sleep(0.02)
+
+    run(Scheduler(Flask(__name__), 0.02, func, mode='delay'), 0.13)
+    assert len(starts) == 4
+    assert starts[1] - starts[0] >= 0.04
+
+
+def test_stats():
+    """Test run times are recorded."""
+    scheduler = Scheduler(Flask(__name__), 1, lambda: eventlet.sleep(0.02), name='wait')
+    run(scheduler, 0.05)
+    stats = scheduler.stats()
+    assert stats['name'] == 'wait'
+    assert stats['runs'] == 1
+    assert 0.02 <= stats['runtime']['max'] <= stats['latency']['max'] < 0.05
+    assert stats['runtime']['buckets'][0.025] == 1
+
+
+def test_histogram():
+    """Test bucketing and quantiles."""
+    histogram = Histogram([0.1, 1, float('inf')])
+    for value in [0.05, 0.1, 0.5, 2]:
+        histogram.add(value)
+    assert histogram.counts == [2, 1, 1]
+    assert histogram.quantile(0.5) == 0.1
+    assert histogram.quantile(1) == 2
+    assert histogram.to_dict()['mean'] == pytest.approx(0.6625)
+
+
+def test_cron():
+    """Test finding the next matching time."""
+    weekdays = Cron('*/15 9-17 * * 1-5')
+    # Saturday
+    assert weekdays.next(datetime(2024, 1, 6, 12, 0)) == datetime(2024, 1, 8, 9, 0)
+    assert weekdays.next(datetime(2024, 1, 8, 9, 0)) == datetime(2024, 1, 8, 9, 15)
+    assert weekdays.next(datetime(2024, 1, 8, 17, 50)) == datetime(2024, 1, 9, 9, 0)
+
+    assert Cron('0 0 1 1 *').next(datetime(2024, 6, 1)) == datetime(2025, 1, 1)
+    # the 13th or a Friday
+    assert Cron('0 0 13 * 5').next(datetime(2024, 1, 1)) == datetime(2024, 1, 5)
+    assert Cron('30 12 29 2 *').next(datetime(2024, 3, 1)) == datetime(2028, 2, 29, 12, 30)
+
+    with pytest.raises(ValueError):
+        Cron('* * *')
+    with pytest.raises(ValueError):
+        Cron('60 * * * *')
+
+
+def test_invalid():
+    """Test the schedule is checked."""
+    with pytest.raises(ValueError):
+        Scheduler(Flask(__name__), None, print)
+    with pytest.raises(ValueError):
+        Scheduler(Flask(__name__), 1, print, cron='* * * * *')
+    with pytest.raises(ValueError):
+        Scheduler(Flask(__name__), 1, print, overlap='drop')
+
+
+def test_pause():
+    """Test a paused scheduler holds back runs and starts over when resumed."""
+    starts = []
+    scheduler = Scheduler(Flask(__name__), 0.02, lambda: starts.append(time.monotonic()))
+    scheduler.pause()
+    scheduler.start()
+    eventlet.sleep(0.05)
+    assert starts == []
+    assert scheduler.stats()['paused']
+
+    resumed = time.monotonic()
+    scheduler.resume()
+    eventlet.sleep(0.03)
+    scheduler.pause()
+    assert len(starts) == 2
+    assert starts[0] - resumed < 0.01
+    eventlet.sleep(0.05)
+    scheduler.stop()
+    assert len(starts) == 2
+
+
+def test_socketio_request_starts():
+    """Test a worker that only serves socket.io requests starts its schedules."""
+    app = App()
+
+    @app.schedule(1)
+    def update():  # pylint: disable=unused-variable
+        pass
+
+    schedule = app.schedules[0]
+    assert schedule.thread is None
+    Client(app).get('/socket.io/?EIO=3&transport=polling')
+    assert schedule.thread is not None
+    # only once
+    thread = schedule.thread
+    Client(app).get('/socket.io/?EIO=3&transport=polling')
+    assert schedule.thread is thread
+    schedule.stop()
@@ -1,12 +1,21 @@
 #!/usr/bin/env python
 """Serialization testing."""
 
+from datetime import datetime
+from pathlib import Path
+import subprocess
+import sys
+
 import numpy as np
 import pandas as pd
+import pytest
 
-from bowtie._component import jdumps, pack
+from bowtie import App, register_encoder
+from bowtie._component import jdumps, pack, unpack
+from bowtie.visual import Table
 
 
+ROOT = Path(__file__).parents[2]
 NPARRAY = np.array([5, 6])
 NPSCALAR = np.int32(5)
 DATES = pd.date_range('2017-01-01', periods=2)
@@ -24,3 +33,130 @@ def test_msgpack():
     assert pack(NPARRAY) == pack([5, 6])
     assert pack(NPSCALAR) == pack(5)
     assert pack(DATES) == pack(['2017-01-01T00:00:00', '2017-01-02T00:00:00'])
+
+
+def test_typed_arrays():
+    """Tests numeric arrays are sent as raw buffers."""
+    floats = np.arange(1000, dtype=np.float64)
+    # only a few bytes for the msgpack extension header
+    assert len(pack(floats)) < floats.nbytes + 8
+    assert np.array_equal(unpack(pack(floats)), floats)
+
+    # 64 bit integers are kept exact
+    big = np.array([2 ** 53 + 1, -(2 ** 62)], dtype=np.int64)
+    assert unpack(pack(big)) == big.tolist()
+    assert unpack(pack(np.array([2 ** 64 - 1], dtype=np.uint64))) == [2 ** 64 - 1]
+
+    result = unpack(pack(np.array([1, 2], dtype=np.int16)))
+    assert result.dtype == np.int16
+
+    matrix = np.arange(6, dtype=np.float32).reshape(2, 3)
+    rows = unpack(pack(matrix))
+    assert len(rows) == 2
+    assert np.array_equal(rows[1], matrix[1])
+
+    series = pd.Series([1.5, 2.5])
+    assert np.array_equal(unpack(pack(series)), series.values)
+
+
+def test_untyped_arrays():
+    """Tests arrays without typed array equivalents are sent as lists."""
+    assert pack(np.array([True, False])) == pack([True, False])
+    assert pack(np.array(['a', 'b'])) == pack(['a', 'b'])
+    assert pack(pd.Index(['a', 'b'])) == pack(['a', 'b'])
+
+
+def test_datetimes():
+    """Tests datetime arrays match element wise isoformat."""
+    dates = [
+        pd.date_range('2017-01-01', periods=3, freq='1500ms'),
+        pd.date_range('2017-01-01', periods=3, tz='US/Eastern'),
+        pd.DatetimeIndex(['2017-01-01', None]),
+    ]
+    for index in dates:
+        isoformats = ['NaT' if x is pd.NaT else x.isoformat() for x in index]
+        assert unpack(pack(index)) == isoformats
+        assert unpack(pack(pd.Series(index))) == isoformats
+
+
+def test_epoch():
+    """Tests datetimes sent as milliseconds since epoch."""
+    result = unpack(pack(pd.DatetimeIndex(['1970-01-02', None]), datetime_format='epoch'))
+    assert result[0] == 86400000
+    assert np.isnan(result[1])
+    eastern = pd.date_range('1970-01-01', periods=1, tz='US/Eastern')
+    assert unpack(pack(pd.Series(eastern), datetime_format='epoch'))[0] == 5 * 3600 * 1000
+    assert jdumps(DATES, datetime_format='epoch') == jdumps([1483228800000.0, 1483315200000.0])
+
+
+def test_app_datetime_format():
+    """Tests the format is taken from the current app."""
+    day = datetime(1970, 1, 2)
+    epoch = App(datetime_format='epoch')
+    with epoch.app.app_context():
+        assert unpack(pack(day)) == 86400000
+        assert unpack(pack(day, datetime_format='iso')) == day.isoformat()
+    with App().app.app_context():
+        assert unpack(pack(day)) == day.isoformat()
+    assert unpack(pack(day)) == day.isoformat()
+    with pytest.raises(ValueError):
+        App(datetime_format='unix')
+
+
+def test_datetime64_scalars():
+    """Tests numpy datetime scalars are encoded like arrays."""
+    values = np.array(['2017-01-01T12:00', '2017-01-01T12:00:00.5', 'NaT'], dtype='datetime64[ns]')
+    for fmt in ('iso', 'epoch'):
+        array = unpack(pack(values, datetime_format=fmt))
+        scalars = [unpack(pack(x, datetime_format=fmt)) for x in values]
+        assert scalars[:2] == list(array[:2])
+        assert jdumps(list(values), datetime_format=fmt) == jdumps(values, datetime_format=fmt)
+    assert unpack(pack(values[0])) == '2017-01-01T12:00:00'
+    assert unpack(pack(values[2])) == 'NaT'
+
+
+class Point:
+    """User defined type."""
+
+    def __init__(self, x, y):
+        """Create a point."""
+        self.x = x
+        self.y = y
+
+
+class Point3D(Point):
+    """Subclass of a user defined type."""
+
+
+def test_register_encoder():
+    """Tests user defined encoders apply to subclasses too."""
+    register_encoder(Point, lambda p: dict(x=p.x, y=p.y))
+    assert pack(Point(1, 2)) == pack({'x': 1, 'y': 2})
+    assert pack(Point3D(3, 4)) == pack({'x': 3, 'y': 4})
+    assert jdumps([Point(1, np.int32(2))]) == '[{"x": 1, "y": 2}]'
+
+
+def test_override_builtin():
+    """Tests user encoders win over the built-in pandas encoders registered later."""
+    # a new interpreter so the pandas encoders are registered on the first encode
+    script = (
+        'import pandas as pd\n'
+        'from bowtie import register_encoder\n'
+        'from bowtie._component import pack, unpack\n'
+        'register_encoder(pd.Series, lambda s: {"custom": s.tolist()})\n'
+        'print(unpack(pack(pd.Series([1.0, 2.0]))))\n'
+    )
+    output = subprocess.run(
+        [sys.executable, '-c', script], stdout=subprocess.PIPE, check=True, cwd=ROOT
+    ).stdout
+    assert output.decode().strip() == "{'custom': [1.0, 2.0]}"
+
+
+def test_table_data():
+    """Tests tables are sent by column."""
+    frame = pd.DataFrame({'a': [1.5, 2.5], 3: ['x', 'y']}, index=[10, 20])
+    data, columns = unpack(pack(Table._make_data(frame)))  # pylint: disable=protected-access
+    assert np.array_equal(data['a'], [1.5, 2.5])
+    assert data['3'] == ['x', 'y']
+    assert data['key'] == ['10', '20']
+    assert [c['dataIndex'] for c in columns] == ['a', '3']
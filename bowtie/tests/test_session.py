@@ -0,0 +1,67 @@
+"""Test sending commands to one client outside of a request."""
+# pylint: disable=protected-access
+
+import eventlet
+
+from bowtie import App
+from bowtie.control import Slider
+from bowtie._component import unpack
+
+
+def test_per_session():
+    """Test a scheduled function is called for each client and only updates that client."""
+    app = App()
+    slider = Slider()
+    app.add(slider)
+    calls = []
+
+    @app.schedule(0.05, per_session=True)
+    def update():  # pylint: disable=unused-variable
+        calls.append(1)
+        slider.do_value(len(calls))
+
+    first = app._socketio.test_client(app.app)
+    app._prepare()
+    first.disconnect()
+    clients = [app._socketio.test_client(app.app) for _ in range(2)]
+    for client in clients:
+        client.emit('view', str(app._root._uuid))
+    assert len(app.sessions) == 2
+    eventlet.sleep(0.03)
+    for schedule in app.schedules:
+        schedule.stop()
+
+    values = [[unpack(m['args'][0]['data']) for m in c.get_received()] for c in clients]
+    assert sorted(values) == [[1], [2]]
+    for client in clients:
+        client.disconnect()
+    assert app.sessions == []
+
+
+def test_pause_idle():
+    """Test scheduled functions only run while clients are connected."""
+    app = App()
+    calls = []
+
+    @app.schedule(0.01, pause_idle=True)
+    def update():  # pylint: disable=unused-variable
+        calls.append(1)
+
+    @app.schedule(0.01)
+    def always():  # pylint: disable=unused-variable
+        pass
+
+    app._prepare()
+    eventlet.sleep(0.03)
+    assert calls == []
+    assert [s.paused for s in app.schedules] == [True, False]
+
+    client = app._socketio.test_client(app.app)
+    eventlet.sleep(0.03)
+    assert calls
+    client.disconnect()
+    count = len(calls)
+    eventlet.sleep(0.03)
+    assert len(calls) == count
+    for schedule in app.schedules:
+        schedule.stop()
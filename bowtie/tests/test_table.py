@@ -0,0 +1,47 @@
+"""Test server side tables."""
+# pylint: disable=protected-access
+
+import numpy as np
+import pandas as pd
+
+from bowtie.visual import Table, _Pages
+
+
+FRAME = pd.DataFrame({'a': [3, 1, 2, 5, 4], 'b': list('xyxyz'), 'c': [0.5, np.nan, 1.5, 2.5, 3.5]})
+
+
+def test_sort():
+    """Test pages are sorted."""
+    pages = _Pages(FRAME)
+    data, total = pages.page(1, 2, 'a', 'ascend')
+    assert total == 5
+    assert data['key'].tolist() == ['1', '2']
+    data, total = pages.page(1, 2, 'a', 'descend')
+    assert data['key'].tolist() == ['3', '4']
+    data, total = pages.page(3, 2)
+    assert data['key'].tolist() == ['4']
+
+
+def test_filter():
+    """Test pages are filtered."""
+    pages = _Pages(FRAME)
+    data, total = pages.page(1, 10, 'a', 'ascend', {'b': ['x', 'z']})
+    assert total == 3
+    assert data['key'].tolist() == ['2', '0', '4']
+
+
+def test_columns():
+    """Test only columns with few values are filterable."""
+    columns = _Pages(FRAME).columns()
+    assert all(column['sorter'] for column in columns)
+    assert [x['value'] for x in columns[1]['filters']] == ['x', 'y', 'z']
+    assert 'filters' not in columns[2]
+
+
+def test_server_side():
+    """Test data isn't sent with the component."""
+    table = Table(FRAME, server_side=True)
+    assert table.data == {}
+    assert 'serverSide={true}' in table._comp
+    assert table._handlers()
+    assert not Table(FRAME)._handlers()
@@ -0,0 +1,121 @@
+"""Test commands only go to clients displaying the component."""
+# pylint: disable=protected-access
+
+import eventlet
+
+from bowtie import App, View
+from bowtie.control import Slider
+from bowtie._component import unpack
+from bowtie._views import ViewTracker, room
+
+
+def test_route():
+    """Test hidden commands are deferred or dropped."""
+    views = ViewTracker()
+    views.add(1, [10])
+    views.add(2, [20])
+    frame = [(True, '10#value', b'a'), (True, '20#value', b'b'), (False, '20#extend', b'c')]
+
+    # until the client reports its view its components aren't listening
+    assert views.route('x', frame) == [('x', [])]
+    assert views.open('x', 1) == [('10#value', b'a')]
+    assert views.route('x', frame) == [('x', [('10#value', b'a')])]
+    assert views.route('x', [(True, '20#value', b'd'), (True, '30#value', b'e')]) == [
+        ('x', [('30#value', b'e')])
+    ]
+    assert views.open('x', 2) == [('20#value', b'd')]
+    assert views.open('x', 2) == []
+
+    assert views.route(None, frame) == [
+        (room(None), []),
+        (room(1), [('10#value', b'a')]),
+        (room(2), [('20#value', b'b'), ('20#extend', b'c')]),
+    ]
+    # broadcasts are kept for every client that opens the view
+    assert views.open('y', 2) == [('20#value', b'b')]
+    assert views.open('y', 1) == [('10#value', b'a')]
+    assert views.open('z', 1) == [('10#value', b'a')]
+
+
+def test_order():
+    """Test a deferred broadcast never replaces newer commands a client got."""
+    views = ViewTracker()
+    views.add(1, [10])
+    views.add(2, [20])
+    views.route(None, [(True, '20#value', b'old')])
+    views.open('x', 2)
+    assert views.route('x', [(True, '20#value', b'new')]) == [('x', [('20#value', b'new')])]
+    assert views.open('x', 1) == []
+    assert views.open('x', 2) == []
+
+    # whichever is newer wins
+    views.route('x', [(True, '20#value', b'mine')])
+    views.route(None, [(True, '20#value', b'all')])
+    assert views.open('x', 2) == [('20#value', b'all')]
+    assert views.open('x', 2) == []
+
+    # commands are replayed in the order they were issued
+    views.open('y', 1)
+    views.route('y', [(True, '20#max', b'a')])
+    views.route(None, [(True, '20#value', b'b')])
+    views.route('y', [(True, '20#min', b'c')])
+    assert views.open('y', 2) == [('20#max', b'a'), ('20#value', b'b'), ('20#min', b'c')]
+
+
+def test_app():
+    """Test a client gets the commands of its view."""
+    app = App(rows=2)
+    first = Slider()
+    second = Slider()
+    app.add(first)
+    view = View()
+    view.add(second)
+    app.add_route(view, 'second')
+
+    client = app._socketio.test_client(app.app)
+    app._endpoints()
+    client.disconnect()
+    client = app._socketio.test_client(app.app)
+    client.emit('view', str(app._root._uuid))
+    with app.app.app_context():
+        first.do_value(1)
+        second.do_value(2)
+    received = client.get_received()
+    assert [(m['name'], unpack(m['args'][0]['data'])) for m in received] == [
+        (f'{first._uuid}#value', 1)
+    ]
+
+    client.emit('view', str(view._uuid))
+    received = client.get_received()
+    assert [(m['name'], unpack(m['args'][0]['data'])) for m in received] == [
+        (f'{second._uuid}#value', 2)
+    ]
+
+    # unknown views are ignored
+    for uuid in ['x', None, '12345']:
+        client.emit('view', uuid)
+    assert app._views.view(client.sid) == view._uuid
+
+
+def test_initialize():
+    """Test commands sent before the client reports its view reach it once it does."""
+    app = App()
+    slider = Slider()
+    app.add(slider)
+
+    @app.load
+    def load():  # pylint: disable=unused-variable
+        slider.do_value(1)
+
+    app._endpoints()
+    client = app._socketio.test_client(app.app)
+    client.emit('INITIALIZE')
+    eventlet.sleep(0.01)
+    assert not client.get_received()
+
+    client.emit('view', str(app._root._uuid))
+    received = client.get_received()
+    assert [(m['name'], unpack(m['args'][0]['data'])) for m in received] == [
+        (f'{slider._uuid}#value', 1)
+    ]
+    client.disconnect()
@@ -1,8 +1,8 @@
 """Visual components."""
 
-from typing import Dict, Optional, List, Union, Tuple
+from typing import Any, Callable, Dict, Optional, List, Union, Tuple, cast
 
-from bowtie._component import Component, jdumps, jsbool
+from bowtie._component import Component, jdumps, jsbool, ordered, pack, unpack, session_id
 from bowtie._progress import Progress
 
 
@@ -26,16 +26,116 @@ class _Visual(Component):
         return self._insert(tagwrap, self._comp)
 
 
+class _Pages:
+    """DataFrame held on the server and sent to the client a page at a time."""
+
+    # columns with more unique values than this can't be filtered
+    MAX_FILTERS = 20
+
+    def __init__(self, data) -> None:
+        self.data = data
+        self._positions = {str(column): i for i, column in enumerate(data.columns)}
+        self._order = {}  # type: Dict[str, Any]
+
+    def _column(self, name: str):
+        return self.data.iloc[:, self._positions[name]]
+
+    def _sorted(self, name: str):
+        """Row positions that sort the column, computed once per column."""
+        # numpy isn't an explicit dependency of bowtie
+        # but it's always available with pandas
+        import numpy as np
+
+        if name not in self._order:
+            column = self._column(name)
+            try:
+                order = np.argsort(column.values, kind='mergesort')
+            except TypeError:
+                order = np.argsort(column.astype(str).values, kind='mergesort')
+            self._order[name] = order
+        return self._order[name]
+
+    def columns(self) -> List[Dict]:
+        """Sortable columns, filterable when there are few unique values."""
+        columns = Table._make_columns(self.data.columns)
+        for column in columns:
+            column['sorter'] = True
+            values = self._column(column['dataIndex'])
+            if values.dtype.kind != 'f':
+                uniques = values.dropna().unique()
+                if len(uniques) <= self.MAX_FILTERS:
+                    column['filters'] = [dict(text=str(x), value=str(x)) for x in uniques]
+        return columns
+
+    def page(
+        self,
+        page: int,
+        size: int,
+        field: Optional[str] = None,
+        order: Optional[str] = None,
+        filters: Optional[Dict[str, List[str]]] = None,
+    ) -> Tuple[Dict, int]:
+        """Select a page of rows after sorting and filtering.
+
+        Parameters
+        ----------
+        page : int
+            Page number starting from 1.
+        size : int
+            Number of rows in a page.
+        field : str, optional
+            Column to sort by.
+        order : str, optional
+            Either 'ascend' or 'descend'.
+        filters : dict, optional
+            Maps column names to the values of rows to keep.
+
+        Returns
+        -------
+        tuple
+            Data for the page and the number of rows after filtering.
+
+        """
+        import numpy as np
+
+        if field in self._positions and order is not None:
+            positions = self._sorted(field)
+            if order == 'descend':
+                positions = positions[::-1]
+        else:
+            positions = np.arange(len(self.data))
+
+        if filters:
+            keep = np.ones(len(self.data), dtype=bool)
+            for name, values in filters.items():
+                if values and name in self._positions:
+                    keep &= self._column(name).astype(str).isin(values).values
+            positions = positions[keep[positions]]
+
+        start = (page - 1) * size
+        stop = start + size
+        data, _ = Table._make_data(self.data.iloc[positions[start:stop]])
+        return data, len(positions)
+
+
 class Table(_Visual):
     """Ant Design table with filtering and sorting."""
 
     _TEMPLATE = 'table.jsx'
     _COMPONENT = 'AntTable'
     _PACKAGE = None
-    _ATTRS = 'columns={{{columns}}} ' 'resultsPerPage={{{results_per_page}}}'
+    _ATTRS = (
+        'columns={{{columns}}} '
+        'resultsPerPage={{{results_per_page}}} '
+        'serverSide={{{server_side}}}'
+    )
 
     def __init__(
-        self, data=None, columns: Optional[List[Union[int, str]]] = None, results_per_page: int = 10
+        self,
+        data=None,
+        columns: Optional[List[Union[int, str]]] = None,
+        results_per_page: int = 10,
+        server_side: bool = False,
     ) -> None:
         """Create a table and optionally initialize the data.
 
@@ -46,19 +146,33 @@ class Table(_Visual):
             List of column names to display.
         results_per_page : int, optional
             Number of rows on each pagination of the table.
+        server_side : bool, optional
+            Keep the data on the server and only send the page being viewed.
+            Sorting and filtering also happen on the server.
+            Use this for large tables.
 
         """
         super().__init__()
-        self.data = []  # type: List[Dict]
+        self.data = {}  # type: Dict
         self.columns = []  # type: List[Dict]
-        if data:
+        self.server_side = server_side
+        # pages for each client, None holds the data shared by all clients
+        self._pages = {}  # type: Dict[Optional[str], _Pages]
+        if data is not None and server_side:
+            self._pages[None] = _Pages(data)
+            self.columns = self._pages[None].columns()
+        elif data is not None:
             self.data, self.columns = self._make_data(data)
         elif columns:
             self.columns = self._make_columns(columns)
 
         self.results_per_page = results_per_page
 
-        self._comp = self._tag.format(columns=self.columns, results_per_page=self.results_per_page)
+        self._comp = self._tag.format(
+            columns=jdumps(self.columns),
+            results_per_page=self.results_per_page,
+            server_side=jsbool(self.server_side),
+        )
 
     @staticmethod
     def _make_columns(columns: List[Union[int, str]]) -> List[Dict]:
@@ -66,21 +180,47 @@ class Table(_Visual):
         return [dict(title=str(c), dataIndex=str(c), key=str(c)) for c in columns]
 
     @staticmethod
-    def _make_data(data) -> Tuple[List[Dict], List[Dict]]:
-        """Transform table data into JSON."""
-        jsdata = []
-        for idx, row in data.iterrows():
-            row.index = row.index.astype(str)
-            rdict = row.to_dict()
-            rdict.update(dict(key=str(idx)))
-            jsdata.append(rdict)
+    def _make_data(data) -> Tuple[Dict, List[Dict]]:
+        """Transform table data into columns of values.
 
+        Whole columns are serialized at once, the client builds
+        the rows for the page being displayed.
+        """
+        jsdata = {str(column): data.iloc[:, i] for i, column in enumerate(data.columns)}
+        jsdata['key'] = data.index.astype(str)
         return jsdata, Table._make_columns(data.columns)
 
-    # pylint: disable=no-self-use
+    def _handlers(self) -> Dict[str, Callable]:
+        if self.server_side:
+            return {'page': self._page}
+        return {}
+
+    def _page(self, query: bytes) -> bytes:
+        """Send the page the client asked for."""
+        request = cast(Dict[str, Any], unpack(query))
+        pages = self._pages.get(session_id(), self._pages.get(None))
+        if pages is None:
+            return pack([{}, 0])
+        return pack(
+            pages.page(
+                request['page'],
+                self.results_per_page,
+                request.get('sortField'),
+                request.get('sortOrder'),
+                request.get('filters'),
+            )
+        )
+
+    def _disconnect(self, sid: str) -> None:
+        self._pages.pop(sid, None)
+
     def do_data(self, data):
         """Replace the columns and data of the table.
 
+        With ``server_side`` the data is kept on the server for the client
+        this is called for, or all clients if it's called outside of a callback,
+        and only the first page is sent.
+
         Parameters
         ----------
         data : pandas.DataFrame
@@ -90,8 +230,14 @@ class Table(_Visual):
         None
 
         """
+        if self.server_side:
+            pages = _Pages(data)
+            self._pages[session_id()] = pages
+            jsdata, total = pages.page(1, self.results_per_page)
+            return jsdata, pages.columns(), total
         return self._make_data(data)
 
+    # pylint: disable=no-self-use
     def do_columns(self, columns):
         """Update the columns of the table.
 
@@ -367,6 +513,76 @@ class Plotly(_Visual):
         """
         return layout
 
+    @ordered
+    def do_extend(self, update, traces=0, max_points=None):
+        """Append points to traces without resending the plot.
+
+        Only the new points are sent and drawn, use this for streaming data.
+
+        Parameters
+        ----------
+        update : dict
+            New values keyed by trace attribute.
+            If ``traces`` is an int the values are the points for that trace,
+            e.g. ``{'x': [4, 5], 'y': [1, 2]}``.
+            If ``traces`` is a list the values are lists of points, one for each trace.
+        traces : int or list of int, optional
+            Indices of the traces to extend.
+        max_points : int, optional
+            Keep at most this many of the most recent points in each trace.
+
+        Returns
+        -------
+        None
+
+        Examples
+        --------
+        >>> plot = Plotly()
+        >>> def callback(value):
+        ...     plot.do_extend({'y': [value]}, max_points=100)
+
+        """
+        if isinstance(traces, int):
+            update = {key: [value] for key, value in update.items()}
+            traces = [traces]
+        return update, traces, max_points
+
+    @ordered
+    def do_restyle(self, update, traces=None):
+        """Update attributes of traces without resending the data.
+
+        Parameters
+        ----------
+        update : dict
+            Trace attributes to change, e.g. ``{'marker.color': 'red'}``.
+            A list value sets each trace to the corresponding element,
+            wrap arrays in a list to set array attributes.
+        traces : int or list of int, optional
+            Indices of the traces to update, all traces by default.
+
+        Returns
+        -------
+        None
+
+        """
+        return update, traces
+
+    @ordered
+    def do_relayout(self, layout):
+        """Update parts of the layout without redrawing the data.
+
+        Parameters
+        ----------
+        layout : dict
+            Layout attributes to change, e.g. ``{'xaxis.range': [0, 5]}``.
+
+        Returns
+        -------
+        None
+
+        """
+        return layout
+
     def do_config(self, config):
         """Update the configuration of the plot.
 
@@ -1,37 +1,34 @@
 #!/usr/bin/env python
 """Example Bowtie App."""
 
-from bowtie import App
+from bowtie import App, MemoryCache
 from bowtie.control import Nouislider
 from bowtie.visual import Plotly
 from bowtie import Pager, cache, command
 
-import numpy as np
 from numpy import random as rng
-import plotlywrapper as pw
 
 
-app = App(debug=True, sidebar=True)
+# keep the walk on the server instead of asking the browser every tick
+app = App(debug=True, sidebar=True, cache=MemoryCache())
 pager = Pager()
 sigma = Nouislider(start=0., minimum=0.1, maximum=50.)
-mainplot = Plotly()
+mainplot = Plotly(dict(data=[dict(y=[0.0], mode='lines')], layout=dict(autosize=False)))
 
 app.add_sidebar(sigma)
 app.add(mainplot)
 
 
-def initialize():
-    cache.save('data', [0.] * 100)
-
-
 @app.subscribe(pager)
 def upgraph():
-    data = cache.load('data')
+    last = cache['last']
+    if last is None:
+        last = 0.0
     value = float(sigma.get())
-    data.pop(0)
-    data.append(value * rng.randn() + data[-1])
-    mainplot.do_all(pw.line(data).to_json())
-    cache.save('data', data)
+    last += value * rng.randn()
+    # only send the new point, the plot keeps the latest 100
+    mainplot.do_extend({'y': [last]}, max_points=100)
+    cache['last'] = last
 
 
 @app.schedule(0.1)